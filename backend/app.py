@@ -1,33 +1,36 @@
 from __future__ import annotations
 
-import asyncio
-import json
-from typing import Any, Dict, Optional
+from typing import Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, WebSocket
 from logger import *
 from modules.service import Service
 from modules.pipeline import SimplePipeline
-from modules.paraformer_local import ParaformerLocal
+from modules.paraformer_local import get_shared_paraformer
 from langchain_openai import ChatOpenAI
-import os
 from config import get_config
 from modules.edge_tts import EdgeTTS
 from modules.llm_manager import SimpleAgent
 
+_llm_config = get_config().llm
 llm = ChatOpenAI(
-    api_key=get_config().llm.api_key,
-    base_url=get_config().llm.base_url,
-    model=get_config().llm.model
+    api_key=_llm_config.api_key,
+    base_url=_llm_config.base_url,
+    model=_llm_config.model
 )
 
+# 模型加载很重（ASR权重/HTTP客户端），进程内只构建一次，所有连接共享。
+# 经注册表按参数去重，其他入口用相同参数拿到的也是同一个实例。
+# 每个连接的会话状态（ASR缓存、对话历史）仍保存在各自的Service/SimpleAgent里。
+asr_model = get_shared_paraformer()
+tts_model = EdgeTTS()
+
 def create_app(config_path: Optional[str] = None) -> FastAPI:
     app = FastAPI(title="ZTalk", version="0.1.0")
 
     @app.websocket("/ws")
     async def websocket_endpoint(ws: WebSocket) -> None:
-        service = Service(ws, SimplePipeline(asr_model=ParaformerLocal(),llm=SimpleAgent(llm), tts_model=EdgeTTS()))
+        service = Service(ws, SimplePipeline(asr_model=asr_model, llm=SimpleAgent(llm), tts_model=tts_model))
         await service.handle_message_loop()
     return app
 
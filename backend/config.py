@@ -1,17 +1,22 @@
+from dataclasses import make_dataclass
 from pathlib import Path
-from types import SimpleNamespace
 
 import yaml
 
 
 def _dict_to_namespace(data):
+	# 配置只读：dict冻结为frozen+slots的dataclass（属性访问比SimpleNamespace快），
+	# list冻结为tuple
 	if isinstance(data, dict):
-		return SimpleNamespace(**{k: _dict_to_namespace(v) for k, v in data.items()})
+		cls = make_dataclass(
+			"FrozenConfig", list(data.keys()), frozen=True, slots=True
+		)
+		return cls(*(_dict_to_namespace(v) for v in data.values()))
 	if isinstance(data, list):
-		return [
+		return tuple(
 			_dict_to_namespace(item)
 			for item in data
-		]
+		)
 	return data
 
 
@@ -21,4 +26,3 @@ config = _dict_to_namespace(_CONFIG_DICT)
 def get_config():
 	return config
 __all__ = ["get_config"]
-
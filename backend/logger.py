@@ -1,6 +1,9 @@
 from pathlib import Path
+import atexit
 import logging
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 _log_dir = Path(__file__).resolve().parents[2] / "zht_talk_logs"
 _log_dir.mkdir(parents=True, exist_ok=True)
@@ -8,17 +11,33 @@ _log_dir.mkdir(parents=True, exist_ok=True)
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 _log_file = f"{_log_dir}/{timestamp}.log"
 
+# 日志写盘/写终端都是阻塞I/O，放到监听线程执行；
+# 事件循环线程里的logger调用只剩一次入队
+_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+_file_handler = logging.FileHandler(_log_file, encoding="utf-8")
+_file_handler.setFormatter(_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_formatter)
+
+_queue = queue.Queue(-1)
+
 logging.basicConfig(
 	level=logging.INFO,
-	format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-	handlers=[
-		logging.FileHandler(_log_file, encoding="utf-8"),
-		logging.StreamHandler(),
-	],
+	handlers=[QueueHandler(_queue)],
+)
+
+_listener = QueueListener(
+	_queue,
+	_file_handler,
+	_stream_handler,
+	respect_handler_level=True,
 )
+_listener.start()
+atexit.register(_listener.stop)
 
 logger = logging.getLogger("zht_talk")
 
 
 
-__all__ = ["logger"]
\ No newline at end of file
+__all__ = ["logger"]
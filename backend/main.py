@@ -18,6 +18,15 @@ def main() -> None:
         host=get_config().backend.host,
         port=get_config().backend.port,
         factory=False,
+        # uvloop+httptools明显快于标准库事件循环/解析器
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        # 放大WebSocket单消息上限，避免TTS音频流被背压卡住
+        ws_max_size=16 * 1024 * 1024,
+        ws_ping_interval=20,
+        ws_ping_timeout=20,
+        backlog=2048,
     )
 
 
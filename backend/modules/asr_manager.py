@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import asyncio
+import logging
 import os
 import sys
 import time
@@ -54,9 +55,17 @@ class ASRManager:
         self.chunk_count = 0
         self.asr_cache = {}  # ASR流式识别缓存
 
-        # 音频缓冲区 - 优化版本，减少数据复制
-        self.audio_buffer = deque(maxlen=1000)  # 最多保存1000个音频块
-        self.buffer_lock = asyncio.Lock()
+        # 音频缓冲区 - SoA布局：PCM字节与final标志分列存储，避免每帧构造dict
+        # 不设maxlen：满时deque会静默丢最旧帧，破坏识别；改为入口显式丢新帧并计数
+        self.audio_buffer = deque()  # PCM字节块
+        self.final_flags = deque()  # 与audio_buffer一一对应的final标志
+        self.buffer_high_water = 1000  # 超过该帧数触发丢帧保护
+        self.dropped_frames = 0  # 因背压丢弃的帧数
+        self.last_frame_time = 0.0  # 最近一帧的到达时间
+        self.last_sample_rate = 16000  # 最近一帧的采样率
+        # 单生产者(_handle_audio_frame)/单消费者(_asr_consumer)都在同一事件循环上，
+        # deque操作天然原子，无需加锁；消费者空闲时靠该事件唤醒
+        self._has_audio = asyncio.Event()
 
         # 流式ASR相关参数 - 参考Stream类的实现
         self.asr_model = self.pipeline.get_asr_model()
@@ -71,10 +80,15 @@ class ASRManager:
                 self.asr_model.chunk_secs,
             )
 
-        # 音频保存状态
-        self.is_recording = False  # 是否正在录音
-        self.recording_start_time = None  # 录音开始时间
-        self.recording_buffer = []  # 录音缓冲区
+        # PCM转float的复用输出缓冲区，按需增长
+        self._float_scratch = np.empty(
+            (self.chunk_bytes // 2 if self.chunk_bytes else 16000) * 4,
+            dtype=np.float32,
+        )
+
+        # 整段语音的累积缓冲区 - 预分配并跨语音段复用，
+        # 写入用定长切片赋值（memcpy），避免extend反复扩容拷贝
+        self._accum_buffer = bytearray((self.chunk_bytes or 19200) * 100)
 
         # 消费者状态
         self.consumer_state = ConsumerState()
@@ -84,6 +98,9 @@ class ASRManager:
         self.verification_delay = 1.0
         self.verification_task: Optional[asyncio.Task] = None
 
+        # 高频路径上预绑定工厂方法，省掉每次发布时的类属性查找
+        self._create_asr_result = EventFactory.create_asr_result
+
         # 设置事件监听器
         self._setup_event_listeners()
 
@@ -91,10 +108,11 @@ class ASRManager:
 
     def _setup_event_listeners(self):
         """设置事件监听器"""
-        # 音频帧接收事件
+        # 音频帧接收事件 - 帧率最高的内部处理器，走免包装的可信分发
         self.event_bus.subscribe(
             AudioFrameReceived,
             self._handle_audio_frame,
+            safe=False,
         )
 
         # VAD开始事件
@@ -109,28 +127,47 @@ class ASRManager:
             self._handle_vad_speech_end,
         )
 
-    async def _handle_audio_frame(self, event: AudioFrameReceived) -> None:
-        """处理音频帧事件"""
-        # 添加音频数据到缓冲区
-        async with self.buffer_lock:
-            self.audio_buffer.append(
-                {
-                    "data": event.audio_data,
-                    "timestamp": time.time(),
-                    "sample_rate": getattr(event, "sample_rate", 16000),
-                    "is_final": getattr(event, "is_final", False),
-                }
+    def _handle_audio_frame(self, event: AudioFrameReceived) -> None:
+        """处理音频帧事件
+
+        纯同步：入队+置位唤醒事件，配合publish_nowait整条音频入口
+        不产生任何协程帧。
+        """
+        # 背压保护：消费者跟不上时显式丢新帧并上报，而不是静默丢最旧帧；
+        # final标记帧必须入队，否则语音段永远无法收尾
+        if (
+            len(self.audio_buffer) >= self.buffer_high_water
+            and not getattr(event, "is_final", False)
+        ):
+            self.dropped_frames += 1
+            if self.dropped_frames == 1 or self.dropped_frames % 100 == 0:
+                logger.warning(
+                    "ASR音频缓冲区积压，丢弃音频帧, 累计丢弃: %d",
+                    self.dropped_frames,
+                )
+                error_event = EventFactory.create_error(
+                    error_type="asr_buffer_overflow",
+                    error_message=f"音频缓冲区超过{self.buffer_high_water}帧，累计丢弃{self.dropped_frames}帧",
+                    component="ASRManager",
+                )
+                self.event_bus.publish_nowait(error_event)
+            return
+
+        # 添加音频数据到缓冲区 - 只存字节本身，元数据记在并行结构里
+        self.audio_buffer.append(event.audio_data)
+        self.final_flags.append(getattr(event, "is_final", False))
+        self.last_frame_time = time.time()
+        self.last_sample_rate = getattr(event, "sample_rate", 16000)
+        self._has_audio.set()
+
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "音频帧已加入缓冲区 大小: %d",
+                len(event.audio_data),
             )
-            
-        logger.debug(
-            "音频帧已加入缓冲区 大小: %d",
-            len(event.audio_data),
-        )
 
-        # 如果正在录音，累积音频数据
-        if self.is_recording:
-            self.recording_buffer.append(event.audio_data)
-    
+
     async def _start_asr_processing(self) -> None:
         """启动ASR处理"""
         logger.info("启动ASR处理")
@@ -197,37 +234,49 @@ class ASRManager:
         """ASR音频消费者"""
         logger.info("ASR消费者开始运行")
 
-        accumulated_audio = bytearray()
+        accumulated_audio = self._accum_buffer
+        write_index = 0  # 已写入的字节数
         processed_bytes = 0
         last_metadata = {}  # 保存最后一个音频块的元数据
 
+        # 逐帧循环里的高频引用绑定成局部变量，免去重复的属性查找
+        audio_buffer = self.audio_buffer
+        final_flags = self.final_flags
+        has_audio = self._has_audio
+        is_debug_enabled = logger.isEnabledFor
+
         try:
             while self.consumer_state.running:
                 # 检查缓冲区是否有数据
-                audio_chunk = None
-                async with self.buffer_lock:
-                    if self.audio_buffer:
-                        audio_chunk = self.audio_buffer.popleft()
-
-                if audio_chunk:
-                    # 直接累积音频数据，减少数据复制
-                    chunk_data = audio_chunk["data"]
-                    accumulated_audio.extend(chunk_data)
+                chunk_data = None
+                is_final = False
+                if audio_buffer:
+                    chunk_data = audio_buffer.popleft()
+                    is_final = final_flags.popleft()
+
+                if chunk_data is not None:
+                    # 写入预分配缓冲区，等长切片赋值不触发重新分配
+                    end = write_index + len(chunk_data)
+                    if end > len(accumulated_audio):
+                        accumulated_audio.extend(bytes(end - len(accumulated_audio)))
+                    accumulated_audio[write_index:end] = chunk_data
+                    write_index = end
 
                     # 保存元数据（只需要最后一个的）
                     last_metadata = {
-                        "timestamp": audio_chunk["timestamp"],
-                        "sample_rate": audio_chunk["sample_rate"],
-                        "is_final": audio_chunk.get("is_final", False),
+                        "timestamp": self.last_frame_time,
+                        "sample_rate": self.last_sample_rate,
+                        "is_final": is_final,
                     }
 
-                    is_final = last_metadata["is_final"]
-
-                    logger.debug(
-                        "ASR消费者处理音频块, 块大小: %d, 累积字节: %d",
-                        len(chunk_data),
-                        len(accumulated_audio),
-                    )
+                    # 每帧都会走到这里，显式判级避免无谓的参数求值
+                    debug_enabled = is_debug_enabled(logging.DEBUG)
+                    if debug_enabled:
+                        logger.debug(
+                            "ASR消费者处理音频块, 块大小: %d, 累积字节: %d",
+                            len(chunk_data),
+                            write_index,
+                        )
 
                     # 检查是否需要处理累积的数据
                     should_process = False
@@ -235,40 +284,47 @@ class ASRManager:
                     if is_final:
                         # 遇到final情况，立即处理
                         should_process = True
-                        logger.debug(
-                            "ASR遇到final音频块，立即处理累积数据, 累积字节: %d",
-                            len(accumulated_audio),
-                        )
+                        if debug_enabled:
+                            logger.debug(
+                                "ASR遇到final音频块，立即处理累积数据, 累积字节: %d",
+                                write_index,
+                            )
                     elif (
                         self.chunk_bytes
-                        and len(accumulated_audio) - processed_bytes >= self.chunk_bytes
+                        and write_index - processed_bytes >= self.chunk_bytes
                     ):
                         # 累积到足够的字节数
                         should_process = True
-                        logger.debug(
-                            "ASR累积到足够字节数，开始处理, 累积字节: %d, chunk字节: %d",
-                            len(accumulated_audio),
-                            self.chunk_bytes,
-                        )
-
-                    if should_process and len(accumulated_audio) > processed_bytes:
+                        if debug_enabled:
+                            logger.debug(
+                                "ASR累积到足够字节数，开始处理, 累积字节: %d, chunk字节: %d",
+                                write_index,
+                                self.chunk_bytes,
+                            )
+
+                    if should_process and write_index > processed_bytes:
                         # 处理累积的音频数据
                         await self._process_accumulated_audio(
-                            accumulated_audio, processed_bytes, is_final, last_metadata
+                            accumulated_audio,
+                            processed_bytes,
+                            write_index,
+                            is_final,
+                            last_metadata,
                         )
                         self.consumer_state.last_activity = time.time()
                         self.consumer_state.processed_chunks += 1
 
                         # 更新已处理的字节数
                         if is_final:
-                            processed_bytes = len(accumulated_audio)
+                            processed_bytes = write_index
                         else:
-                            processed_bytes = len(accumulated_audio) - (
-                                len(accumulated_audio) % self.chunk_bytes
+                            processed_bytes = write_index - (
+                                write_index % self.chunk_bytes
                             )# type:ignore
                 else:
-                    # 没有数据，短暂等待
-                    await asyncio.sleep(0.005)  # 5ms，减少等待时间
+                    # 没有数据，等待生产者唤醒，避免定时轮询
+                    has_audio.clear()
+                    await has_audio.wait()
 
         except asyncio.CancelledError:
             logger.debug("ASR消费者被取消")
@@ -285,14 +341,18 @@ class ASRManager:
             await self.event_bus.publish(error_event)
         finally:
             # 处理剩余的累积数据
-            if len(accumulated_audio) > processed_bytes:
+            if write_index > processed_bytes:
                 logger.debug(
                     "ASR处理剩余的累积音频数据,剩余字节: %d",
-                    len(accumulated_audio) - processed_bytes,
+                    write_index - processed_bytes,
                 )
                 try:
                     await self._process_accumulated_audio(
-                        accumulated_audio, processed_bytes, True, last_metadata
+                        accumulated_audio,
+                        processed_bytes,
+                        write_index,
+                        True,
+                        last_metadata,
                     )
                 except Exception as e:
                     logger.error(
@@ -307,6 +367,7 @@ class ASRManager:
         self,
         accumulated_audio: bytearray,
         processed_bytes: int,
+        write_index: int,
         is_final: bool,
         metadata: dict,
     ) -> None:
@@ -314,16 +375,18 @@ class ASRManager:
         处理累积的音频数据 - 优化版本
 
         Args:
-            accumulated_audio: 累积的音频字节数据
+            accumulated_audio: 累积的音频字节缓冲区（预分配，有效数据到write_index为止）
             processed_bytes: 已处理的字节数
+            write_index: 已写入的字节数
             is_final: 是否为最终处理
             metadata: 音频元数据（timestamp, sample_rate等）
         """
         try:
             self.consumer_state.processing = True
 
-            # 提取需要处理的音频数据
-            audio_data = bytes(accumulated_audio[processed_bytes:])
+            # 提取需要处理的音频数据 - memoryview切片零拷贝，
+            # np.frombuffer直接在缓冲区上建立视图
+            audio_data = memoryview(accumulated_audio)[processed_bytes:write_index]
 
             # 检查音频数据是否为空
             if not audio_data or len(audio_data) == 0:
@@ -335,19 +398,10 @@ class ASRManager:
                 logger.warning("无ASR模型，跳过ASR处理")
                 return
 
-            # 转换音频格式
-            audio_float = self._pcm_to_float(audio_data)
-
-            # 获取ASR模型的目标采样率
-            target_sample_rate = getattr(self.asr_model, "TARGET_SAMPLE_RATE", 16000)
-            logger.debug(
-                "ASR模型的目标采样率: %d",
-                target_sample_rate,
-            )
-
+            # 转换音频格式并切分chunk（单次融合内核，无额外拷贝）
             # TODO: adapt to more ASR models
             new_text = ""
-            chunks = self.asr_model.get_chunks(audio_float, target_sample_rate)
+            chunks = self._pcm_to_chunks(audio_data)
 
             for chunk in chunks:
                 # 使用asr_cache，确保缓存状态正确
@@ -356,13 +410,14 @@ class ASRManager:
                 )
                 if chunk_text:
                     new_text += chunk_text
-                    logger.debug(
-                        "ASR识别到新文本: %s", chunk_text
-                    )
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "ASR识别到新文本: %s", chunk_text
+                        )
 
-            # 如果是最终结果，清空缓存
+            # 如果是最终结果，就地清空缓存，让模型重建初始状态
             if is_final:
-                self.asr_cache = {}
+                self.asr_model.reset_stream_cache(self.asr_cache)
                 logger.debug("ASR缓存已清空")
 
             # 处理识别结果
@@ -397,14 +452,45 @@ class ASRManager:
         """
         将PCM字节数据转换为float numpy数组
 
+        单次乘法写入复用的scratch缓冲区，避免astype+除法产生两个临时数组。
+        返回的是scratch的视图，下游只读，复用安全。
+
         Args:
-            pcm: PCM字节数据
+            pcm: PCM字节数据（bytes或memoryview等任意buffer对象）
 
         Returns:
             np.ndarray: float音频数据数组
         """
         pcm_int16 = np.frombuffer(pcm, dtype=np.int16)
-        return pcm_int16.astype(np.float32) / 32768.0
+        if pcm_int16.size > self._float_scratch.size:
+            self._float_scratch = np.empty(pcm_int16.size, dtype=np.float32)
+        out = self._float_scratch[: pcm_int16.size]
+        np.multiply(pcm_int16, np.float32(1.0 / 32768.0), out=out, casting="unsafe")
+        return out
+
+    def _pcm_to_chunks(self, pcm: bytes) -> list:
+        """
+        PCM字节 -> float chunk列表的融合内核
+
+        转换和切分在一次numpy扫描内完成，chunk是scratch缓冲区上的视图，
+        不做任何拷贝。音频已是模型目标采样率（_handle_audio_frame入口约定），
+        无需经过asr_model.get_chunks的重采样路径。
+
+        Args:
+            pcm: PCM字节数据
+
+        Returns:
+            list: float32 chunk视图列表，末尾chunk可能不足整长
+        """
+        audio = self._pcm_to_float(pcm)
+        if self.chunk_bytes:
+            chunk_samples = self.chunk_bytes // 2
+        else:
+            target_sample_rate = getattr(self.asr_model, "TARGET_SAMPLE_RATE", 16000)
+            return self.asr_model.get_chunks(audio, target_sample_rate)
+        return [
+            audio[i : i + chunk_samples] for i in range(0, audio.size, chunk_samples)
+        ]
 
     async def _publish_asr_result(
         self, text: str, is_final: bool, confidence: float
@@ -417,12 +503,16 @@ class ASRManager:
             is_final: 是否为最终结果
             confidence: 置信度
         """
-        event = EventFactory.create_asr_result(
+        event = self._create_asr_result(
             text=text,
             is_final=is_final,
             confidence=confidence,
         )
-        await self.event_bus.publish(event)
+        if is_final:
+            await self.event_bus.publish(event)
+        else:
+            # 部分结果只是给前端的提示，不需要回压，走同步快速路径
+            self.event_bus.publish_nowait(event)
 
         logger.info(
             "ASR结果已发布,文本: %s, 最终: %s",
@@ -440,14 +530,16 @@ class ASRManager:
         self.accumulated_text = ""
         self.confidence_sum = 0.0
         self.chunk_count = 0
-        self.asr_cache = {}  # 重置ASR缓存
+        if self.asr_model:
+            self.asr_model.reset_stream_cache(self.asr_cache)  # 重置ASR缓存
 
         # 完全重置消费者状态
         self.consumer_state = ConsumerState()
 
         # 清空音频缓冲区
-        async with self.buffer_lock:
-            self.audio_buffer.clear()
+        self.audio_buffer.clear()
+        self.final_flags.clear()
+        self._has_audio.clear()
 
         logger.info("ASR状态已完全重置")
 
@@ -1,21 +1,12 @@
 # -*- coding: utf-8 -*-
 import asyncio
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Dict, List, Callable, Any, Optional, Set, Type, Union
-import weakref
+from typing import Dict, List, Callable, Any, Optional, Set, Tuple, Type, Union
 
 from logger import *
 
 from .events import BaseEvent, EventFactory
 
 
-@dataclass
-class EventHandler:
-    """事件处理器包装类"""
-    handler: Callable
-
-
 class EventBus:
     """事件总线"""
 
@@ -28,8 +19,10 @@ class EventBus:
             max_history: 最大历史记录数量
         """
         # 事件处理器映射，统一按事件类型字符串作为键
-        # {event_type(str): [EventHandler]}
-        self._handlers: Dict[str, List[EventHandler]] = defaultdict(list)
+        # 发布远比订阅频繁，直接存扁平的tuple，发布时零间接访问；
+        # 是否为协程函数在订阅时判定一次（iscoroutinefunction并不便宜）
+        # {event_type(str): ((handler, is_coro, safe), ...)}
+        self._handlers: Dict[str, Tuple[Tuple[Callable, bool, bool], ...]] = {}
 
         # 事件历史记录
         self._max_history = max_history
@@ -42,31 +35,38 @@ class EventBus:
             "handlers_count": 0,
         }
 
-        # 活跃的异步任务
-        self._active_tasks: Set[asyncio.Task] = set()
+        # 活跃任务跟踪 - 计数器+完成事件用于排空等待；任务本体持
+        # 强引用：asyncio自身只弱引用在途Task，仅存WeakSet的话任务
+        # 可能中途被GC掉，完成回调里discard保证及时释放
+        self._inflight = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._task_refs: set = set()
+
+        # 事件类 -> 类型字符串的缓存，避免重复的属性探测
+        self._key_cache: Dict[type, str] = {}
 
     def _get_event_key(self, event_identifier: Union[Type[BaseEvent], str]) -> str:
         """将事件标识（事件类或事件类型字符串）标准化为事件类型字符串键"""
         # 已是字符串类型
         if isinstance(event_identifier, str):
             return event_identifier
-        # 事件类，优先使用 TYPE
-        try:
+        # 事件类，查缓存；未命中时优先使用 TYPE，退化为类名字符串
+        key = self._key_cache.get(event_identifier)
+        if key is None:
             evt_type = getattr(event_identifier, "TYPE", None)
             if isinstance(evt_type, str) and evt_type:
-                return evt_type
-        except Exception:
-            pass
-        # 退化为类名字符串
-        try:
-            return event_identifier.__name__
-        except Exception:
-            return str(event_identifier)
+                key = evt_type
+            else:
+                key = getattr(event_identifier, "__name__", str(event_identifier))
+            self._key_cache[event_identifier] = key
+        return key
 
     def subscribe(
         self,
         event_class: Union[Type[BaseEvent], str],
         handler: Callable[[BaseEvent], Any],
+        safe: bool = True,
     ) -> None:
         """
         订阅事件
@@ -74,14 +74,12 @@ class EventBus:
         Args:
             event_class: 事件类（BaseEvent 子类）或事件类型字符串（如 "tts.started"）
             handler: 事件处理函数
-            priority: 优先级，数字越大优先级越高
-            session_filter: 会话过滤器，只处理特定会话的事件
+            safe: 是否用异常包装层分发；内部可信的高频处理器可传False，
+                省掉每次分发的额外协程帧（异常退化为仅记录日志）
         """
-        event_handler = EventHandler(
-            handler=handler
-        )
         key = self._get_event_key(event_class)
-        self._handlers[key].append(event_handler)
+        entry = (handler, asyncio.iscoroutinefunction(handler), safe)
+        self._handlers[key] = self._handlers.get(key, ()) + (entry,)
 
     async def publish(
         self, event: BaseEvent, wait_for_completion: bool = False
@@ -101,23 +99,36 @@ class EventBus:
 
             # 获取事件处理器（按事件类型字符串匹配）
             event_type = event.event_type
-            handlers = self._handlers.get(event_type, [])
+            handlers = self._handlers.get(event_type, ())
             if not handlers:
                 logger.debug("没有找到事件处理器: %s", event_type)
+                if event._POOLED:
+                    event.release()
                 return True
 
-            # 创建处理任务
-            tasks = []
-            for handler in handlers:
-                task = asyncio.create_task(self._handle_event_safe(handler, event))
-                tasks.append(task)
-                self._active_tasks.add(task)
-
-                # 任务完成后清理
-                task.add_done_callback(self._active_tasks.discard)
-
-            if wait_for_completion and tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+            # 分发事件 - 避免为每个处理器单独创建Task
+            if wait_for_completion:
+                await asyncio.gather(
+                    *(self._handle_event_safe(h, event) for h in handlers),
+                    return_exceptions=True,
+                )
+                if event._POOLED:
+                    event.release()
+            elif len(handlers) == 1:
+                # 单处理器内联执行，完全省掉Task创建和调度
+                entry = handlers[0]
+                if entry[2]:
+                    await self._handle_event_safe(entry, event)
+                elif entry[1]:
+                    # 可信处理器直接调用，异常由下方的except记录
+                    await entry[0](event)
+                else:
+                    entry[0](event)
+                if event._POOLED:
+                    event.release()
+            else:
+                # 多处理器合并进一个Task；池化事件在_dispatch_all末尾归还
+                self._track_task(asyncio.create_task(self._dispatch_all(handlers, event)))
 
             return True
 
@@ -136,20 +147,120 @@ class EventBus:
 
             return False
 
-    async def _handle_event_safe(self, handler: EventHandler, event: BaseEvent) -> None:
+    def publish_nowait(self, event: BaseEvent) -> bool:
+        """同步发布事件，不等待任何处理器完成
+
+        同步处理器当场调用（异常仅记录日志，不再发ErrorOccurred）；
+        协程处理器合并进一个Task调度。适合AudioFrameReceived、
+        ASRResultPartial这类无需回压的热路径事件，省掉publish本身的
+        协程帧和一次await调度。
+
+        Args:
+            event: 要发布的事件
+
+        Returns:
+            是否成功发布
+        """
+        try:
+            self._stats["events_published"] += 1
+
+            event_type = event.event_type
+            handlers = self._handlers.get(event_type, ())
+            if not handlers:
+                if event._POOLED:
+                    event.release()
+                return True
+
+            coro_entries = None
+            for entry in handlers:
+                if entry[1]:
+                    if coro_entries is None:
+                        coro_entries = []
+                    coro_entries.append(entry)
+                else:
+                    try:
+                        entry[0](event)
+                    except Exception as e:
+                        logger.error(
+                            "事件处理器异常: %s, event_type: %s, handler: %s",
+                            e,
+                            event_type,
+                            entry[0].__name__,
+                        )
+
+            if coro_entries:
+                self._track_task(
+                    asyncio.create_task(
+                        self._dispatch_all(tuple(coro_entries), event)
+                    )
+                )
+            elif event._POOLED:
+                event.release()
+
+            return True
+
+        except Exception as e:
+            logger.error("发布事件失败: %s", e)
+            return False
+
+    async def _dispatch_all(
+        self, handlers: Tuple[Tuple[Callable, bool, bool], ...], event: BaseEvent
+    ) -> None:
+        """在单个Task内依次分发给所有处理器
+
+        safe处理器的异常已在_handle_event_safe内消化；
+        可信(safe=False)处理器的异常在gather结果里统一记录。
+        """
+        coros = []
+        coro_entries = []
+        for entry in handlers:
+            if entry[2]:
+                coros.append(self._handle_event_safe(entry, event))
+                coro_entries.append(entry)
+            elif entry[1]:
+                coros.append(entry[0](event))
+                coro_entries.append(entry)
+            else:
+                # 可信的同步处理器直接调用
+                try:
+                    entry[0](event)
+                except Exception as e:
+                    logger.error(
+                        "事件处理器异常: %s, event_type: %s, handler: %s",
+                        e,
+                        event.event_type,
+                        entry[0].__name__,
+                    )
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for entry, result in zip(coro_entries, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "事件处理器异常: %s, event_type: %s, handler: %s",
+                    result,
+                    event.event_type,
+                    entry[0].__name__,
+                )
+        # 所有订阅者都处理完，池化事件可安全归还
+        if event._POOLED:
+            event.release()
+
+    async def _handle_event_safe(
+        self, entry: Tuple[Callable, bool, bool], event: BaseEvent
+    ) -> None:
         """
         安全处理事件，捕获异常
 
         Args:
-            handler: 事件处理器
+            entry: (处理函数, 是否为协程函数, 是否安全包装)
             event: 事件对象
         """
+        handler, is_coro, _ = entry
         try:
             # 调用处理器
-            if asyncio.iscoroutinefunction(handler.handler):
-                await handler.handler(event)
+            if is_coro:
+                await handler(event)
             else:
-                handler.handler(event)
+                handler(event)
 
         except Exception as e:
             logger.error("事件处理器异常: %s, event_type: %s", e, event.event_type)
@@ -158,13 +269,25 @@ class EventBus:
                 error_event = EventFactory.create_error(
                     error_type="event_handler_error",
                     error_message=str(e),
-                    component=f"Handler:{handler.handler.__name__}",
+                    component=f"Handler:{handler.__name__}",
                 )
                 # 创建异步任务发布错误事件
-                error_task = asyncio.create_task(self.publish(error_event))
-                self._active_tasks.add(error_task)
-                error_task.add_done_callback(self._active_tasks.discard)
+                self._track_task(asyncio.create_task(self.publish(error_event)))
+
 
+    def _track_task(self, task: asyncio.Task) -> None:
+        """跟踪一个在途任务：计数加一，完成时减一并在归零时置位排空事件"""
+        self._inflight += 1
+        self._drained.clear()
+        self._task_refs.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        """任务完成回调"""
+        self._task_refs.discard(task)
+        self._inflight -= 1
+        if self._inflight <= 0:
+            self._drained.set()
 
     async def _wait_for_all_handlers(self, timeout: float = 3.0):
         """
@@ -176,20 +299,17 @@ class EventBus:
         Returns:
             是否所有处理器都完成
         """
-        if not self._active_tasks:
+        if self._inflight <= 0:
             return
 
         try:
-            await asyncio.wait_for(
-                asyncio.gather(*self._active_tasks, return_exceptions=True),
-                timeout=timeout,
-            )
+            await asyncio.wait_for(self._drained.wait(), timeout=timeout)
         except asyncio.TimeoutError:
             logger.warning(
                 "等待事件处理器超时，仍有 %d 个任务未完成，强制取消",
-                len(self._active_tasks),
+                self._inflight,
             )
-            for task in self._active_tasks:
+            for task in self._task_refs:
                 if not task.done():
                     task.cancel()
 
@@ -204,14 +324,13 @@ class EventBus:
 
         # 清理资源
         self._handlers.clear()
-        self._active_tasks.clear()
 
         logger.info("事件总线已关闭")
 
     def __del__(self):
         """析构函数"""
         # 清理资源
-        if hasattr(self, "_active_tasks"):
-            for task in self._active_tasks:
+        if hasattr(self, "_task_refs"):
+            for task in self._task_refs:
                 if not task.done():
                     task.cancel()
@@ -1,33 +1,82 @@
 # -*- coding: utf-8 -*-
+import itertools
+import os
 import time
-import uuid
-from dataclasses import dataclass, field, asdict
-from typing import ClassVar, Dict, Any, Optional
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import ClassVar, Dict, Any, Mapping, Optional, Tuple, Union
 
+# 事件ID只用于日志关联，不需要加密级随机；
+# pid+单调纳秒时钟+进程内递增计数，构造上保证唯一，连随机数都省掉
+_counter = itertools.count()
+_pid_hex = "%08x" % os.getpid()
 
-@dataclass
+
+def _fast_id(
+    _pid_hex=_pid_hex,
+    _monotonic_ns=time.monotonic_ns,
+    _next=next,
+    _counter=_counter,
+) -> str:
+    return "%s%016x%08x" % (_pid_hex, _monotonic_ns(), _next(_counter))
+
+
+# 本地绑定，工厂高频调用时省一次模块属性查找
+_now = time.time
+
+
+def _mk(cls, _fast_id=_fast_id, _now=_now, **kw):
+    """统一注入event_id/timestamp的事件构造入口
+
+    _fast_id/_now通过默认参数绑定成局部变量，比每次查模块全局更快。
+    """
+    return cls(event_id=_fast_id(), timestamp=_now(), **kw)
+
+
+@dataclass(slots=True)
 class BaseEvent:
     event_id: str
     timestamp: float
     TYPE: ClassVar[str] = "base"
+    # 每个事件类首次to_dict时缓存自己的字段名tuple
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
+    # 高频事件类置True并实现release()，事件总线分发完后自动归还池中
+    _POOLED: ClassVar[bool] = False
 
     @property
     def event_type(self) -> str:
         return self.TYPE
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
+        # 不走dataclasses.asdict：它递归deepcopy所有字段，
+        # 会把bytes音频载荷整个克隆一遍；这里按缓存的字段名浅取即可
+        cls = self.__class__
+        names = cls.__dict__.get("_FIELDS")
+        if not names:
+            names = tuple(f.name for f in fields(cls))
+            cls._FIELDS = names
+        d = {name: getattr(self, name) for name in names}
         d["event_type"] = self.TYPE
         return d
 
+    def to_mapping(self) -> Mapping[str, Any]:
+        """只读浅视图，供按键读取字段的消费者使用
 
-@dataclass
+        bytes载荷（audio_data/audio_chunk）原样引用不拷贝；
+        内部新代码优先用这个而不是to_dict。
+        """
+        return MappingProxyType(self.to_dict())
+
+
+@dataclass(slots=True)
 class WebSocketMessageReceived(BaseEvent):
     TYPE: ClassVar[str] = "websocket.message_received"
     message: str = ""
+    # 网关层解析好的消息体；为None表示原始文本不是合法JSON
+    parsed: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioFrameReceived(BaseEvent):
     TYPE: ClassVar[str] = "audio.frame_received"
     audio_data: bytes = b""
@@ -36,22 +85,41 @@ class AudioFrameReceived(BaseEvent):
     is_final: bool = False
     audio_format: str = "pcm_s16le"
 
+    # 音频帧速率下分配又即弃的事件走自由表，减少分配器和GC压力
+    _POOLED: ClassVar[bool] = True
+    _pool: ClassVar[list] = []
+    _POOL_MAX: ClassVar[int] = 128
+
+    def __new__(cls, *args, **kwargs):
+        pool = cls._pool
+        if pool:
+            return pool.pop()
+        # slots=True会重建类，零参super()的__class__闭包失效，这里直接走object
+        return object.__new__(cls)
+
+    def release(self) -> None:
+        """归还对象池；由事件总线在所有订阅者处理完后调用"""
+        self.audio_data = b""
+        pool = AudioFrameReceived._pool
+        if len(pool) < AudioFrameReceived._POOL_MAX:
+            pool.append(self)
 
-@dataclass
+
+@dataclass(slots=True)
 class VADSpeechStart(BaseEvent):
     TYPE: ClassVar[str] = "vad.speech_start"
     confidence: float = 0.0
     speech_probability: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class VADSpeechEnd(BaseEvent):
     TYPE: ClassVar[str] = "vad.speech_end"
     confidence: float = 0.0
     speech_probability: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ASRResultPartial(BaseEvent):
     TYPE: ClassVar[str] = "asr.result_partial"
     text: str = ""
@@ -59,7 +127,7 @@ class ASRResultPartial(BaseEvent):
     is_final: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ASRResultFinal(BaseEvent):
     TYPE: ClassVar[str] = "asr.result_final"
     text: str = ""
@@ -67,7 +135,7 @@ class ASRResultFinal(BaseEvent):
     is_final: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationStateChanged(BaseEvent):
     TYPE: ClassVar[str] = "conversation.state_changed"
     from_state: str = ""
@@ -75,56 +143,76 @@ class ConversationStateChanged(BaseEvent):
     reason: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSStarted(BaseEvent):
     TYPE: ClassVar[str] = "tts.started"
     text: str = ""
     task_id: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSStopped(BaseEvent):
     TYPE: ClassVar[str] = "tts.stopped"
     text: str = ""
     task_id: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSPaused(BaseEvent):
     TYPE: ClassVar[str] = "tts.paused"
     text: str = ""
     task_id: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSResponseUpdate(BaseEvent):
     TYPE: ClassVar[str] = "tts.response_update"
     text: str = ""
     task_id: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSResponseFinish(BaseEvent):
     TYPE: ClassVar[str] = "tts.response_finish"
     text: str = ""
     task_id: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSChunkGenerated(BaseEvent):
     TYPE: ClassVar[str] = "tts.chunk_generated"
-    audio_chunk: bytes = b""
+    # 生产者可以直接挂memoryview，省掉切片时的载荷拷贝；
+    # 发送端在出口处按需转bytes
+    audio_chunk: Union[bytes, memoryview] = b""
     task_id: int = 0
     text: str = ""
 
+    _POOLED: ClassVar[bool] = True
+    _pool: ClassVar[list] = []
+    _POOL_MAX: ClassVar[int] = 128
+
+    def __new__(cls, *args, **kwargs):
+        pool = cls._pool
+        if pool:
+            return pool.pop()
+        # slots=True会重建类，零参super()的__class__闭包失效，这里直接走object
+        return object.__new__(cls)
+
+    def release(self) -> None:
+        """归还对象池；由事件总线在所有订阅者处理完后调用"""
+        self.audio_chunk = b""
+        pool = TTSChunkGenerated._pool
+        if len(pool) < TTSChunkGenerated._POOL_MAX:
+            pool.append(self)
+
 
-@dataclass
+@dataclass(slots=True)
 class TTSPlaybackFinished(BaseEvent):
     TYPE: ClassVar[str] = "tts.playback_finished"
     final_text: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult(BaseEvent):
     TYPE: ClassVar[str] = "verification.result"
     is_valid: bool = False
@@ -136,7 +224,7 @@ class VerificationResult(BaseEvent):
     chunk_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorOccurred(BaseEvent):
     TYPE: ClassVar[str] = "error.occurred"
     error_type: str = ""
@@ -146,15 +234,12 @@ class ErrorOccurred(BaseEvent):
 
 
 class EventFactory:
+    # 全部收敛到_mk：各create_*只剩参数透传，字节码更短、调用栈更浅
     @staticmethod
     def create_websocket_message_received(
-         message: str
+         message: str, parsed: Optional[Dict[str, Any]] = None
     ) -> WebSocketMessageReceived:
-        return WebSocketMessageReceived(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            message=message,
-        )
+        return _mk(WebSocketMessageReceived, message=message, parsed=parsed)
 
     @staticmethod
     def create_audio_frame_received(
@@ -162,9 +247,8 @@ class EventFactory:
         sample_rate: int = 48000,
         is_final: bool = False,
     ) -> AudioFrameReceived:
-        return AudioFrameReceived(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
+        return _mk(
+            AudioFrameReceived,
             audio_data=audio_data,
             sample_rate=sample_rate,
             is_final=is_final,
@@ -175,111 +259,60 @@ class EventFactory:
     def create_vad_speech_start(
         confidence: float = 0.0
     ) -> VADSpeechStart:
-        return VADSpeechStart(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            confidence=confidence,
-            speech_probability=confidence,
+        return _mk(
+            VADSpeechStart, confidence=confidence, speech_probability=confidence
         )
 
     @staticmethod
     def create_vad_speech_end(confidence: float = 0.0) -> VADSpeechEnd:
-        return VADSpeechEnd(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            confidence=confidence,
-            speech_probability=confidence,
+        return _mk(
+            VADSpeechEnd, confidence=confidence, speech_probability=confidence
         )
 
     @staticmethod
     def create_asr_result(
         text: str, is_final: bool = False, confidence: float = 0.0
     ) -> BaseEvent:
-        if is_final:
-            return ASRResultFinal(
-                event_id=str(uuid.uuid4()),
-                timestamp=time.time(),
-                text=text,
-                confidence=confidence,
-            )
-        else:
-            return ASRResultPartial(
-                event_id=str(uuid.uuid4()),
-                timestamp=time.time(),
-                text=text,
-                confidence=confidence,
-            )
+        cls = ASRResultFinal if is_final else ASRResultPartial
+        return _mk(cls, text=text, confidence=confidence)
 
     @staticmethod
     def create_tts_started(text: str, task_id: int) -> TTSStarted:
-        return TTSStarted(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            text=text,
-            task_id=task_id,
-        )
+        return _mk(TTSStarted, text=text, task_id=task_id)
 
     @staticmethod
     def create_tts_stopped(text: str, task_id: int) -> TTSStopped:
-        return TTSStopped(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            text=text,
-            task_id=task_id,
-        )
+        return _mk(TTSStopped, text=text, task_id=task_id)
 
     @staticmethod
     def create_tts_paused(text: str, task_id: int) -> TTSPaused:
-        return TTSPaused(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            text=text,
-            task_id=task_id,
-        )
+        return _mk(TTSPaused, text=text, task_id=task_id)
 
     @staticmethod
     def create_tts_response_update(
         task_id: int, text: str
     ) -> TTSResponseUpdate:
-        return TTSResponseUpdate(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            text=text,
-            task_id=task_id,
-        )
+        return _mk(TTSResponseUpdate, text=text, task_id=task_id)
 
     @staticmethod
     def create_tts_response_finish(
         text: str, task_id: int
     ) -> TTSResponseFinish:
-        return TTSResponseFinish(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            text=text,
-            task_id=task_id,
-        )
+        return _mk(TTSResponseFinish, text=text, task_id=task_id)
 
     @staticmethod
     def create_tts_chunk_generated(
-        audio_chunk: bytes, task_id: int, text: str = ""
+        audio_chunk: Union[bytes, memoryview], task_id: int, text: str = ""
     ) -> TTSChunkGenerated:
-        return TTSChunkGenerated(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            audio_chunk=audio_chunk,
-            task_id=task_id,
-            text=text,
+        return _mk(
+            TTSChunkGenerated, audio_chunk=audio_chunk, task_id=task_id, text=text
         )
 
     @staticmethod
     def create_tts_playback_finished(
         final_text: str
     ) -> TTSPlaybackFinished:
-        return TTSPlaybackFinished(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            final_text=final_text,
-        )
+        return _mk(TTSPlaybackFinished, final_text=final_text)
 
     @staticmethod
     def create_error(
@@ -288,9 +321,8 @@ class EventFactory:
         component: str,
         context: Optional[Dict[str, Any]] = None,
     ) -> ErrorOccurred:
-        return ErrorOccurred(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
+        return _mk(
+            ErrorOccurred,
             error_type=error_type,
             error_message=error_message,
             component=component,
@@ -307,14 +339,13 @@ class EventFactory:
         text_length: int = 0,
         chunk_count: int = 0,
     ) -> VerificationResult:
-        return VerificationResult(
-            event_id=str(uuid.uuid4()),
-            timestamp=time.time(),
+        return _mk(
+            VerificationResult,
             is_valid=is_valid,
             text=text,
             confidence=confidence,
             reason=reason,
-            validation_time=time.time(),
+            validation_time=_now(),
             text_length=text_length,
             chunk_count=chunk_count,
         )
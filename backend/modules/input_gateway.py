@@ -1,7 +1,9 @@
+import logging
+
 from fastapi import WebSocket
 from logger import *
 from fastapi import WebSocketDisconnect
-import json
+import orjson
 from .events import EventFactory
 from .event_bus import EventBus
 from .events import ErrorOccurred, WebSocketMessageReceived
@@ -69,42 +71,38 @@ class InputGateway:
     ) -> None:
         """处理WebSocket消息接收事件 - 从网关层接收并处理业务逻辑"""
         try:
-            message = event.message
-
-            logger.info(
-                "收到WebSocket消息,类型: %s",
-                type(message).__name__,
-            )
+            # 每个控制帧都会经过这里，降为debug并前置级别判断
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                logger.debug(
+                    "收到WebSocket消息,类型: %s",
+                    type(event.message).__name__,
+                )
 
-            if isinstance(message, str):  # Handle text messages
-                try:
-                    message_data = json.loads(message)
-                    message_type = message_data.get("action") or message_data.get(
-                        "type", "unknown"
-                    )
+            # 网关层已解析过一次，直接取事件上的dict，避免重复json解析
+            message_data = event.parsed
+            if message_data is not None:
+                message_type = message_data.get("action") or message_data.get(
+                    "type", "unknown"
+                )
 
-                    logger.info(
+                if debug_enabled:
+                    logger.debug(
                         "处理文本信号, 信号: %s",
                         message_type,
                     )
 
-                    if message_type in ["vad_speech_start", "vad_speech_end"]:
-                        await self._handle_vad_signal(message_type, message_data)
-                    else:
-                        logger.warning(
-                            "未知的文本信号类型: %s",
-                            message_type,
-                        )
-
-                except json.JSONDecodeError:
+                if message_type in ["vad_speech_start", "vad_speech_end"]:
+                    await self._handle_vad_signal(message_type, message_data)
+                else:
                     logger.warning(
-                        "无法解析WebSocket消息: %s",
-                        message
+                        "未知的文本信号类型: %s",
+                        message_type,
                     )
-
             else:
                 logger.warning(
-                    "收到未知类型的WebSocket消息"
+                    "无法解析WebSocket消息: %s",
+                    event.message
                 )
 
         except Exception as e:
@@ -113,41 +111,50 @@ class InputGateway:
             )
  
     async def handle_message_loop(self):
+        # 绑定为局部变量，循环内省掉逐次的属性查找；
+        # 音频二进制帧最频繁，放在分支首位，用get代替成员探测
+        recv = self.websocket.receive
+        handle_audio = self._handle_audio_message
+        handle_text = self._handle_text_message
         try:
             while True:
-                data = await self.websocket.receive()
-                await self._process_message(data)
+                data = await recv()
+                try:
+                    audio = data.get("bytes")
+                    if audio is not None:
+                        # 二进制消息（音频数据）- 发布音频帧接收事件
+                        await handle_audio(audio)
+                        continue
+                    text = data.get("text")
+                    if text is not None:
+                        # 文本消息 - 发布WebSocket消息接收事件
+                        await handle_text(text)
+                        continue
+                    # 只有断开等罕见消息会走到这里，type检查留在冷分支
+                    if data.get("type") == "websocket.disconnect":
+                        raise WebSocketDisconnect(data.get("code", 1000))
+                except WebSocketDisconnect:
+                    raise
+                except Exception as e:
+                    logger.error(f"消息处理错误{e}")
         except WebSocketDisconnect:
             logger.info(f"WebSocket断开")
         except Exception as e:
             logger.error(f"消息处理错误，错误: {e}")
 
-    async def _process_message(self, data):
-        try:
-            if data["type"] == "websocket.receive":
-                if "text" in data:
-                    # 文本消息 - 发布WebSocket消息接收事件
-                    await self._handle_text_message(data["text"])
-                elif "bytes" in data:
-                    # 二进制消息（音频数据）- 发布音频帧接收事件
-                    await self._handle_audio_message(data["bytes"])
-
-        except Exception as e:
-            logger.error(f"消息处理错误{e}")
-
     async def _handle_text_message(self, text_message: str) -> None:
         try:
-            message = json.loads(text_message)
+            message = orjson.loads(text_message)
             msg_type = message.get("action") or message.get("type", "unknown")
 
             logger.debug("收到文本消息,type: %s",  msg_type)
 
-            # 发布WebSocket消息接收事件，让业务层处理具体逻辑
+            # 解析结果随事件一起发布，业务层不必再解析一遍
             event = EventFactory.create_websocket_message_received(
-                message=text_message
+                message=text_message, parsed=message
             )
             await self.event_bus.publish(event)
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # 如果不是JSON格式，也发布事件让业务层处理
             event = EventFactory.create_websocket_message_received(
                 message=text_message
@@ -172,10 +179,11 @@ class InputGateway:
         Args:
             audio_data: 音频数据
         """
-        # 发布音频帧接收事件，让业务层处理具体逻辑
+        # 发布音频帧接收事件，让业务层处理具体逻辑；
+        # 订阅者是纯同步的入队操作，走publish_nowait免掉一次协程调度
         event = EventFactory.create_audio_frame_received(
             audio_data=audio_data,
             sample_rate=48000,
             is_final=False,
         )
-        await self.event_bus.publish(event)
+        self.event_bus.publish_nowait(event)
@@ -4,6 +4,15 @@ from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 import re
 from logger import logger
 
+# 单字符删除走translate（一次C级扫描），比逐个replace少两趟拷贝
+_MD_DEL = str.maketrans("", "", "#`")
+# "**"删除与"数字."去点合并进一个预编译正则
+_MD_RE = re.compile(r"\*\*|(\d+)\.")
+
+
+def _md_repl(m: "re.Match") -> str:
+    return m.group(1) or ""
+
 
 class SimpleAgent:
 
@@ -13,25 +22,34 @@ class SimpleAgent:
         system_prompt: str = "You are a friendly conversational partner who always answers in plain text without using any Markdown symbols like #, *, or backticks, or emojis; avoid lists, titles, or structured formatting and just talk in a flowing, natural way; keep your tone casual, like chatting with a friend, using simple everyday language and short sentences, with room for natural fillers such as “well,” “you know,” or “sort of,” while avoiding academic or overly polished style.",
     ):
         self.model = model
-        system_prompt = SystemMessage(content=system_prompt)
-        self.session_history = [system_prompt]
+        if isinstance(system_prompt, SystemMessage):
+            # copy()传入已包装好的消息，直接共享，不重新实例化
+            self._system_message = system_prompt
+        else:
+            self._system_message = SystemMessage(content=system_prompt)
+        self.session_history = [self._system_message]
 
     def _filter_response(self, response: str) -> str:
         """Filter out unwanted characters from the response."""
-        filtered_response = response.replace("#", "").replace("**", "").replace("`", "")
-        # Replace "number." with "number" to avoid markdown-like numbering
-        filtered_response = re.sub(r"(\d+)\.", r"\1", filtered_response)
-        return filtered_response
+        # 流式chunk每秒到达几十上百次，过滤压到两趟：translate删#和`，
+        # 正则同时处理"**"和"数字."
+        return _MD_RE.sub(_md_repl, response.translate(_MD_DEL))
 
     def generate_stream(self, input: str) -> Iterable[str]:
         user_prompt = HumanMessage(input)
         self.session_history.append(user_prompt)
         response = self.model.stream(self.session_history)
         self.session_history.append(AIMessage(content=""))
+        # 逐chunk做str +=是O(N^2)，先攒进list最后join一次；
+        # finally保证提前关闭时历史里也留下已生成的部分
+        parts = []
+        # 逐token的循环里把方法绑定成局部变量，省掉每次的属性查找
+        filter_response = self._filter_response
+        append = parts.append
         try:
             for chunk in response:
-                filtered_chunk = self._filter_response(chunk.content)
-                self.session_history[-1].content += filtered_chunk
+                filtered_chunk = filter_response(chunk.content)
+                append(filtered_chunk)
                 yield filtered_chunk
             logger.debug(f"SimpleAgent stream completed, full history: {self.session_history}")
         except GeneratorExit:
@@ -40,6 +58,9 @@ class SimpleAgent:
         except Exception as e:
             logger.error(f"SimpleAgent stream error: {e}")
             raise
+        finally:
+            self.session_history[-1].content = "".join(parts)
 
     def copy(self) -> "SimpleAgent":
-        return SimpleAgent(self.model, self.session_history[0].content)
+        # 系统提示词在会话间只读，克隆时共享同一个SystemMessage实例
+        return SimpleAgent(self.model, self._system_message)
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
-import json
+import asyncio
+import logging
+import orjson
 from fastapi import WebSocket
 from dataclasses import dataclass
+from typing import Optional
 from logger import logger
 
 from .event_bus import EventBus
@@ -46,6 +49,25 @@ class OutputGateway(EventListenerMixin):
 
         self.state = OutputState()
 
+        # 每类信号复用一个信封dict，发送时原地改字段再编码，
+        # 避免ASR部分结果流里每帧重建内外两层dict；
+        # 同一连接的处理器在事件循环里串行执行，不会并发改写
+        self._update_asr_tmpl = {
+            "action": "update_asr",
+            "data": {"text": "", "confidence": 0.0, "is_final": False},
+        }
+        self._finish_asr_tmpl = {
+            "action": "finish_asr",
+            "data": {"text": "", "confidence": 0.0, "is_final": True},
+        }
+        self._update_resp_tmpl = {"action": "update_resp", "data": {"text": ""}}
+        self._finish_resp_tmpl = {"action": "finish_resp", "data": {"text": ""}}
+
+        # ASR部分结果约10Hz连发，30ms窗口内只把最新假设发往前端，
+        # 减少socket写入次数；最终结果不走这个缓冲
+        self._pending_partial: Optional[ASRResultPartial] = None
+        self._partial_task: Optional[asyncio.Task] = None
+
         logger.debug("信号发送器已初始化")
 
     def _setup_event_listeners(self):
@@ -81,7 +103,9 @@ class OutputGateway(EventListenerMixin):
     async def _send_signal(self, message: dict) -> None:
         """发送WebSocket消息"""
         try:
-            await self.websocket.send_text(json.dumps(message))
+            # orjson是C扩展，编码比标准库json快数倍；
+            # 前端按文本帧解析信号，二进制帧留给音频，故仍走send_text
+            await self.websocket.send_text(orjson.dumps(message).decode())
         except Exception as e:
             logger.error(
                 "发送WebSocket消息失败, 错误: %s", e
@@ -95,45 +119,63 @@ class OutputGateway(EventListenerMixin):
             logger.error("发送二进制数据失败, 错误: %s", e)
 
     async def _send_update_asr_signal(self, event: ASRResultPartial) -> None:
-        """发送ASR更新信号到前端"""
+        """发送ASR更新信号到前端（30ms窗口内合并，只发最新假设）"""
+        self._pending_partial = event
+        if self._partial_task is None:
+            self._partial_task = asyncio.create_task(self._flush_partial())
+
+    async def _flush_partial(self) -> None:
+        """合并窗口到期后把最新的ASR部分结果发往前端"""
         try:
-            logger.info(
-                "发送ASR部分结果到前, 文本: '%s'",
-                event.text,
-            )
+            await asyncio.sleep(0.03)
+            event = self._pending_partial
+            self._pending_partial = None
+            if event is None:
+                return
+
+            # 每帧都走的日志降为debug并前置级别判断，关掉时零开销
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "发送ASR部分结果到前, 文本: '%s'",
+                    event.text,
+                )
 
-            await self._send_signal(
-                {
-                    "action": "update_asr",
-                    "data": {
-                        "text": event.text,
-                        "confidence": getattr(event, "confidence", 0.0),
-                        "is_final": getattr(event, "is_final", False),
-                    },
-                }
-            )
+            data = self._update_asr_tmpl["data"]
+            data["text"] = event.text
+            # 字段由dataclass定义保证存在，直接slot读，不走getattr的默认值兜底
+            data["confidence"] = event.confidence
+            data["is_final"] = event.is_final
+            await self._send_signal(self._update_asr_tmpl)
         except Exception as e:
             logger.error(
                 "发送update_asr信号失败到前端, 错误: %s", e
             )
+        finally:
+            # 被finish_asr取消的旧任务不碰状态，避免清掉接任者的引用
+            if self._partial_task is asyncio.current_task():
+                self._partial_task = None
+                # 发送期间又到了新的部分结果，补一轮窗口避免漏发
+                if self._pending_partial is not None:
+                    self._partial_task = asyncio.create_task(self._flush_partial())
 
     async def _send_finish_asr_signal(self, event: ASRResultFinal) -> None:
         """发送ASR完成信号到前端"""
+        # 丢弃还在合并窗口里的部分结果：最终结果即将发出，窗口到期
+        # 后再补发旧假设会把前端已定稿的用户文本改回去
+        self._pending_partial = None
+        if self._partial_task is not None:
+            self._partial_task.cancel()
+            self._partial_task = None
         try:
             logger.info(
                 "发送ASR结果到前端, 文本: '%s'", event.text
             )
 
-            await self._send_signal(
-                {
-                    "action": "finish_asr",
-                    "data": {
-                        "text": event.text,
-                        "confidence": getattr(event, "confidence", 0.0),
-                        "is_final": getattr(event, "is_final", True),
-                    },
-                }
-            )
+            data = self._finish_asr_tmpl["data"]
+            data["text"] = event.text
+            data["confidence"] = event.confidence
+            data["is_final"] = event.is_final
+            await self._send_signal(self._finish_asr_tmpl)
         except Exception as e:
             logger.error(
                 "发送finish_asr信号失败到前端, 错误: %s", e
@@ -143,11 +185,16 @@ class OutputGateway(EventListenerMixin):
             """发送TTS音频块信号到前端"""
             try:
                 if hasattr(event, "audio_chunk") and event.audio_chunk:
-                    await self._send_binary(event.audio_chunk)
-                    logger.debug(
-                        "已发送TTS音频块到前端, 大小: %s bytes",
-                        len(event.audio_chunk),
-                    )
+                    chunk = event.audio_chunk
+                    # memoryview只在出口处物化一次bytes，上游传递全程零拷贝
+                    if isinstance(chunk, memoryview):
+                        chunk = bytes(chunk)
+                    await self._send_binary(chunk)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "已发送TTS音频块到前端, 大小: %s bytes",
+                            len(chunk),
+                        )
             except Exception as e:
                 logger.error(
                     "发送TTS音频块到前端失败, 错误: %s", e
@@ -156,12 +203,8 @@ class OutputGateway(EventListenerMixin):
     async def _send_update_resp_signal(self, event: TTSResponseUpdate) -> None:
         """发送TTS响应更新信号到前端"""
         try:
-            await self._send_signal(
-                {
-                    "action": "update_resp",
-                    "data": {"text": event.text},
-                }
-            )
+            self._update_resp_tmpl["data"]["text"] = event.text
+            await self._send_signal(self._update_resp_tmpl)
             logger.debug("已发送update_resp信号到前端")
         except Exception as e:
             logger.error(
@@ -171,12 +214,8 @@ class OutputGateway(EventListenerMixin):
     async def _send_finish_resp_signal(self, event: TTSResponseFinish) -> None:
         """发送TTS响应完成信号到前端"""
         try:
-            await self._send_signal(
-                {
-                    "action": "finish_resp",
-                    "data": {"text": event.text},
-                }
-            )
+            self._finish_resp_tmpl["data"]["text"] = event.text
+            await self._send_signal(self._finish_resp_tmpl)
             logger.debug("已发送finish_resp信号到前端")
         except Exception as e:
             logger.error(
@@ -1,11 +1,23 @@
 from funasr import AutoModel
-from typing import Optional, Dict, Any
-import tempfile
+from typing import Optional, Dict, Any, Union
+import contextlib
+import io
+import threading
 import os
 import numpy as np
+import soundfile as sf
 import torchaudio
 import torch
 
+# libsoxr的SIMD多相重采样，比torch算子省掉调度和tensor往返；
+# 未安装时回退torchaudio路径
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+from logger import logger
+
 
 class ParaformerLocal:
     TARGET_SAMPLE_RATE = 16000
@@ -27,6 +39,10 @@ class ParaformerLocal:
         chunk_size: Optional[list] = [0, 10, 5],  # [0, 10, 5] 600ms
         encoder_chunk_look_back: int = 4,  # number of chunks to lookback for encoder self-attention
         decoder_chunk_look_back: int = 1,  # number of encoder chunks to lookback for decoder cross-attention
+        use_onnx: bool = True,
+        quantize: bool = False,
+        dtype: str = "fp32",
+        silence_rms_threshold: float = 0.005,
         **kwargs: Dict[str, Any],
     ):
         """
@@ -48,6 +64,18 @@ class ParaformerLocal:
             chunk_size (list, optional): 流式识别的chunk大小设置，默认[0, 10, 5] 600ms
             encoder_chunk_look_back (int): encoder自注意力回看的chunk数，默认4
             decoder_chunk_look_back (int): decoder交叉注意力回看的chunk数，默认1
+            use_onnx (bool): 是否用ONNX Runtime推理（CPU上算子融合后约2倍提速），
+                默认True；funasr_onnx不可用时自动回退到PyTorch
+            quantize (bool): 是否加载int8动态量化的ONNX模型，默认False。
+                MatMul量化为QInt8可吃到VNNI指令，模型体积减半、RTF更低，
+                WER几乎不变；仅use_onnx时生效
+            dtype (str): PyTorch后端的推理精度，fp32（默认）或bf16。
+                bf16经autocast在算子级生效，AMX/AVX512-BF16或
+                TensorCore硬件上matmul吞吐约翻倍；硬件不支持时
+                自动留在fp32
+            silence_rms_threshold (float): 流式识别的静音门控RMS阈值，
+                低于阈值且当前没有进行中的话语时跳过整个前向计算。
+                对话场景的停顿段能省掉一半以上的模型调用；设为0关闭
             **kwargs: config.yaml中的任何参数，如max_single_segment_time=6000
         """
         self.model_name = model
@@ -70,11 +98,48 @@ class ParaformerLocal:
         self.decoder_chunk_look_back = decoder_chunk_look_back
         self.chunk_secs = self.chunk_size[1] * 0.06
 
+        # ONNX推理开关；_onnx记录实际生效的后端
+        self.use_onnx = use_onnx
+        self.quantize = quantize
+        self.dtype = dtype
+        self.silence_rms_threshold = silence_rms_threshold
+        self._onnx = False
+        # bf16 autocast的生效精度，_init_autocast按硬件能力设置
+        self._autocast_dtype = None
+
+        # 线程数统一压到ncpu：默认配置会吃满全部核心，多会话服务下
+        # 各流互相抢核反而更慢；OMP需在推理库起线程池前设置
+        os.environ.setdefault("OMP_NUM_THREADS", str(self.ncpu))
+        if self.device == "cpu":
+            torch.set_num_threads(self.ncpu)
+
+        # 按源采样率缓存重采样器，多相滤波核只构建一次
+        self._resamplers: Dict[int, torchaudio.transforms.Resample] = {}
+
         # 初始化模型
         self._init_model()
 
     def _init_model(self):
         """初始化funasr模型"""
+        # conformer块里的CPU矩阵乘是流式识别的瓶颈，优先走ONNX Runtime：
+        # 图融合（QKV/LayerNorm等）后单chunk延迟约为PyTorch的一半
+        if self.use_onnx and self.device == "cpu":
+            try:
+                self._init_onnx_model()
+                self._onnx = True
+                return
+            except Exception as e:
+                logger.warning(
+                    "ONNX模型初始化失败，回退到PyTorch: %s", e
+                )
+        self._onnx = False
+        if self.device.startswith("cuda"):
+            # 流式chunk形状固定（chunk_size不变即9600采样点/块），
+            # benchmark模式让cudnn按该形状自动调优一次后缓存内核；
+            # TF32在Ampere及以上给matmul再提一档，精度对ASR无感
+            torch.backends.cudnn.benchmark = True
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
         try:
             # 构建模型参数
             model_kwargs = {
@@ -103,44 +168,140 @@ class ParaformerLocal:
                 model_kwargs.update(self.kwargs)
 
             self.model = AutoModel(**model_kwargs)
+            self._init_autocast()
         except Exception as e:
             raise RuntimeError(f"初始化paraformer模型失败: {e}")
 
-    def _generate_text(self, audio_path: str) -> str:
+    def _init_autocast(self) -> None:
+        """按dtype与硬件能力决定PyTorch推理是否启用bf16 autocast
+
+        权重保持fp32，由autocast在算子级用bf16执行matmul类计算：
+        输入不用手动转换，不存在权重bf16、输入fp32的dtype不匹配。
+        bf16与fp32指数位相同无需缩放，AMX/TensorCore上吞吐约翻倍；
+        硬件不支持时软件模拟反而更慢，保持fp32并给出警告。
+        ONNX后端精度由funasr_onnx自己管理（见quantize），不走这里。
+        """
+        self._autocast_dtype = None
+        if self.dtype != "bf16":
+            return
+        if self.device.startswith("cuda"):
+            supported = torch.cuda.is_bf16_supported()
+        else:
+            _probe = getattr(torch.cpu, "_is_avx512_bf16_supported", None)
+            supported = bool(_probe and _probe())
+        if not supported:
+            logger.warning("当前设备不支持bf16加速，ASR推理保持fp32")
+            return
+        self._autocast_dtype = torch.bfloat16
+        logger.info("ASR推理启用bf16 autocast")
+
+    def _inference_ctx(self):
+        """推理上下文：启用bf16时返回autocast，否则零开销空上下文"""
+        if self._autocast_dtype is not None:
+            return torch.autocast(
+                "cuda" if self.device.startswith("cuda") else "cpu",
+                dtype=self._autocast_dtype,
+            )
+        return contextlib.nullcontext()
+
+    def _init_onnx_model(self):
+        """用funasr_onnx加载融合后的ONNX图，模型只在进程内导出/加载一次"""
+        if self.model_name.endswith("streaming"):
+            from funasr_onnx.paraformer_online_bin import Paraformer as OnnxParaformer
+        else:
+            from funasr_onnx import Paraformer as OnnxParaformer
+
+        # quantize=True时funasr_onnx用QInt8权重的动态量化图
+        # （QUInt8在AVX512_VNNI机器上反而慢一个量级，不要改）。
+        # intra_op压到ncpu；funasr_onnx内部session为顺序执行模式，
+        # 算子间不再另起线程，单流L2局部性最好
+        self.model = OnnxParaformer(
+            self.model_name,
+            batch_size=self.batch_size,
+            device_id=-1,  # CPU
+            quantize=self.quantize,
+            intra_op_num_threads=self.ncpu,
+        )
+
+    def _generate_onnx(self, audio, cache: Optional[dict] = None,
+                       is_final: bool = False):
+        """ONNX后端推理：numpy直接进session，不落临时文件"""
+        if cache is not None:
+            if "cache" not in cache:
+                cache["cache"] = {}
+            cache["is_final"] = is_final
+            return self.model(audio_in=audio, param_dict=cache)
+        return self.model(audio_in=audio)
+
+    def _generate_text(self, audio: Union[str, np.ndarray]) -> str:
         """
         使用模型生成文本
 
         Args:
-            audio_path (str): 音频文件路径
+            audio (str | np.ndarray): 音频文件路径或float32音频数组
 
         Returns:
             str: 识别的文本
         """
-        # 构建生成参数
-        generate_kwargs = {
-            "input": audio_path,
-            "batch_size_s": self.batch_size_s,
-        }
+        if self._onnx:
+            result = self._generate_onnx(audio)
+        else:
+            # 构建生成参数
+            generate_kwargs = {
+                "input": audio,
+                "batch_size_s": self.batch_size_s,
+            }
 
-        if self.hotword:
-            generate_kwargs["hotword"] = self.hotword
+            if self.hotword:
+                generate_kwargs["hotword"] = self.hotword
 
-        # 调用模型进行识别
-        result = self.model.generate(**generate_kwargs)
+            # 调用模型进行识别
+            with self._inference_ctx():
+                result = self.model.generate(**generate_kwargs)
 
-        # 解析结果
-        if isinstance(result, list) and len(result) > 0:
-            # 如果结果是列表，提取文本内容
-            if isinstance(result[0], dict) and "text" in result[0]:
-                return "".join([item.get("text", "") for item in result])
-            elif isinstance(result[0], str):
-                return "".join(result)
-            else:
-                return str(result[0])
-        elif isinstance(result, dict) and "text" in result:
-            return result["text"]
-        else:
-            return str(result)
+        return self._result_to_text(result)
+
+    @staticmethod
+    def _dict_to_text(item: dict) -> str:
+        """从单个结果dict里取出识别文本
+
+        funasr的AutoModel返回"text"键；funasr_onnx返回"preds"键，
+        离线版的值是(文本, tokens)元组，流式版是文本本身。
+        """
+        if "text" in item:
+            return item["text"]
+        preds = item.get("preds")
+        if isinstance(preds, str):
+            return preds
+        if isinstance(preds, (tuple, list)) and preds and isinstance(preds[0], str):
+            return preds[0]
+        raise ValueError(f"无法解析的识别结果结构: {item!r}")
+
+    @staticmethod
+    def _result_to_text(result) -> str:
+        """统一解析generate返回结构为文本
+
+        同时覆盖funasr与funasr_onnx两种后端的返回形状（见
+        _dict_to_text）。paraformer一般只返回单元素列表，单独
+        短路掉，避免为一个dict先建list再join。未知结构直接抛错：
+        str()兜底会把dict的repr当识别文本静默发往前端。
+        """
+        if isinstance(result, list):
+            if not result:
+                return ""
+            first = result[0]
+            if isinstance(first, dict):
+                if len(result) == 1:
+                    return ParaformerLocal._dict_to_text(first)
+                return "".join(
+                    ParaformerLocal._dict_to_text(item) for item in result
+                )
+            if isinstance(first, str):
+                return first if len(result) == 1 else "".join(result)
+            raise ValueError(f"无法解析的识别结果结构: {result!r}")
+        if isinstance(result, dict):
+            return ParaformerLocal._dict_to_text(result)
+        raise ValueError(f"无法解析的识别结果结构: {result!r}")
 
     def set_hotword(self, hotword: str):
         """设置热词"""
@@ -179,21 +340,11 @@ class ParaformerLocal:
         """
         try:
             if isinstance(audio, bytes):
-                # 如果是字节数据，保存为临时文件
-                with tempfile.NamedTemporaryFile(
-                    suffix=".wav", delete=False
-                ) as temp_file:
-                    temp_file.write(audio)
-                    temp_audio_path = temp_file.name
-
-                try:
-                    result = self._generate_text(temp_audio_path)
-                finally:
-                    # 清理临时文件
-                    if os.path.exists(temp_audio_path):
-                        os.unlink(temp_audio_path)
-
-                return result
+                # 字节数据在内存里直接解码，不落临时文件——
+                # 短语音场景下磁盘写读的系统调用开销比识别本身还大
+                speech, sr = sf.read(io.BytesIO(audio), dtype="float32")
+                speech = self.resample(speech, sr)
+                return self._generate_text(speech)
             else:
                 # 如果是文件路径
                 return self._generate_text(audio)
@@ -218,53 +369,57 @@ class ParaformerLocal:
             return self.recognize(audio)
 
         try:
-            # 如果输入是bytes或str类型，需要先转换为numpy数组
-            if isinstance(audio, (bytes, str)):
-                import soundfile as sf
-
-                if isinstance(audio, bytes):
-                    with tempfile.NamedTemporaryFile(
-                        suffix=".wav", delete=False
-                    ) as temp_file:
-                        temp_file.write(audio)
-                        temp_audio_path = temp_file.name
-                else:
-                    temp_audio_path = audio
-
-                try:
-                    speech, _ = sf.read(temp_audio_path)
-                finally:
-                    # 如果是临时文件，清理它
-                    if isinstance(audio, bytes) and os.path.exists(temp_audio_path):
-                        os.unlink(temp_audio_path)
+            # 如果输入是bytes或str类型，需要先转换为numpy数组；
+            # bytes在内存里解码，不再经过临时文件
+            if isinstance(audio, bytes):
+                speech, sr = sf.read(io.BytesIO(audio), dtype="float32")
+                speech = self.resample(speech, sr)
+            elif isinstance(audio, str):
+                speech, sr = sf.read(audio, dtype="float32")
+                speech = self.resample(speech, sr)
             else:
                 speech = audio
 
-            # 调用模型进行流式识别
-            result = self.model.generate(
-                input=speech,
-                cache=cache,
-                is_final=is_final,
-                chunk_size=self.chunk_size,
-                encoder_chunk_look_back=self.encoder_chunk_look_back,
-                decoder_chunk_look_back=self.decoder_chunk_look_back,
-            )
-            # 解析结果
-            if isinstance(result, list) and len(result) > 0:
-                if isinstance(result[0], dict) and "text" in result[0]:
-                    return "".join([item.get("text", "") for item in result])
-                elif isinstance(result[0], str):
-                    return "".join(result)
+            # 静音门控：能量平方和一趟SIMD算完（np.dot），比模型前向
+            # 便宜几个数量级。静音chunk且当前没有进行中的话语时直接
+            # 跳过前向；话语进行中或is_final时照常送模型，让流式解码
+            # 自然收尾，不截断句尾
+            if self.silence_rms_threshold > 0.0 and not is_final and len(speech) > 0:
+                mean_square = float(np.dot(speech, speech)) / len(speech)
+                if mean_square < self.silence_rms_threshold ** 2:
+                    if not cache.get("has_active_utterance"):
+                        return ""
                 else:
-                    return str(result[0])
-            elif isinstance(result, dict) and "text" in result:
-                return result["text"]
+                    cache["has_active_utterance"] = True
+
+            # 调用模型进行流式识别
+            if self._onnx:
+                result = self._generate_onnx(speech, cache=cache, is_final=is_final)
             else:
-                return str(result)
+                with self._inference_ctx():
+                    result = self.model.generate(
+                        input=speech,
+                        cache=cache,
+                        is_final=is_final,
+                        chunk_size=self.chunk_size,
+                        encoder_chunk_look_back=self.encoder_chunk_look_back,
+                        decoder_chunk_look_back=self.decoder_chunk_look_back,
+                    )
+            return self._result_to_text(result)
 
         except Exception as e:
             raise RuntimeError(f"流式语音识别失败: {e}")
 
+    def reset_stream_cache(self, cache: dict) -> None:
+        """就地清空流式识别缓存
+
+        funasr以cache是否为空判断是否需要初始化，且文档化的初始
+        状态（如前端的lookback填充）并不等于清零后的暂存张量，
+        所以这里必须让cache回到真正的空——clear()就地清空，外部
+        持有的dict引用保持有效，下一句由模型自己重建初始状态。
+        """
+        cache.clear()
+
     def is_streaming(self) -> bool:
         """
         Check if the ASR is in streaming mode.
@@ -276,11 +431,34 @@ class ParaformerLocal:
         Resample audio to the model's sampling rate.
         """
         if ori_sampling_rate != self.TARGET_SAMPLE_RATE:
-            # Use torchaudio.transforms.Resample to resample audio
-            audio = torch.FloatTensor(audio)
-            resampler = torchaudio.transforms.Resample(
-                orig_freq=ori_sampling_rate, new_freq=self.TARGET_SAMPLE_RATE
-            )
+            # 优先走libsoxr：纯C的SIMD多相重采样，没有torch算子调度
+            # 和numpy<->tensor往返。不用ResampleStream——模型实例跨
+            # 会话共享，带状态的滤波器会把不同连接的音频串起来
+            if soxr is not None and not isinstance(audio, torch.Tensor):
+                if audio.dtype != np.float32:
+                    audio = audio.astype(np.float32, copy=False)
+                return soxr.resample(
+                    audio,
+                    ori_sampling_rate,
+                    self.TARGET_SAMPLE_RATE,
+                    quality="HQ",
+                )
+            # 每个流式chunk都会经过这里：重采样器按源采样率缓存复用，
+            # 避免每次调用重建多相滤波核
+            resampler = self._resamplers.get(ori_sampling_rate)
+            if resampler is None:
+                resampler = torchaudio.transforms.Resample(
+                    orig_freq=ori_sampling_rate,
+                    new_freq=self.TARGET_SAMPLE_RATE,
+                    dtype=torch.float32,
+                )
+                self._resamplers[ori_sampling_rate] = resampler
+            # 已是tensor就直接用；ndarray经from_numpy共享内存，
+            # 不再用FloatTensor整段memcpy一份
+            if not isinstance(audio, torch.Tensor):
+                if audio.dtype != np.float32:
+                    audio = audio.astype(np.float32, copy=False)
+                audio = torch.from_numpy(audio)
             audio = resampler(audio)
             audio = audio.numpy()
         return audio
@@ -288,8 +466,46 @@ class ParaformerLocal:
     def get_chunks(self, audio: np.ndarray, ori_sampling_rate: int) -> list[np.ndarray]:
         audio = self.resample(audio, ori_sampling_rate)
         chunk_stride = int(self.chunk_secs * self.TARGET_SAMPLE_RATE)
-        total_chunk_num = int(len(audio - 1) / chunk_stride + 1)
-        chunks = []
-        for i in range(total_chunk_num):
-            chunks.append(audio[i * chunk_stride : (i + 1) * chunk_stride])
-        return chunks
+        # 原实现的len(audio - 1)是对整个数组逐元素减1再取长度，
+        # 既多算一遍数组又在音频长度恰为整数倍时多出一个空chunk；
+        # 这里按长度向上取整，末块补零后一次reshape切出所有chunk
+        total_chunk_num = (len(audio) + chunk_stride - 1) // chunk_stride
+        pad = total_chunk_num * chunk_stride - len(audio)
+        if pad:
+            audio = np.pad(audio, (0, pad))
+        # reshape出的每行都是视图，不发生拷贝
+        return list(audio.reshape(total_chunk_num, chunk_stride))
+
+
+class _ParaformerRegistry:
+    """进程级的ParaformerLocal共享注册表
+
+    模型权重有几百MB、加载要数秒，按构造参数去重后整个进程同一套
+    参数只加载一份；会话相关的状态（流式cache、对话历史）都在各自
+    的Service/管理器里，模型实例本身可安全共享。
+    """
+
+    _instances: Dict[tuple, ParaformerLocal] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, **kwargs: Any) -> ParaformerLocal:
+        """按构造参数取共享实例，不存在时在锁内创建"""
+        # list参数（如chunk_size）转成tuple才能进dict key
+        key = tuple(sorted(
+            (k, tuple(v) if isinstance(v, list) else v)
+            for k, v in kwargs.items()
+        ))
+        instance = cls._instances.get(key)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(key)
+                if instance is None:
+                    instance = ParaformerLocal(**kwargs)
+                    cls._instances[key] = instance
+        return instance
+
+
+def get_shared_paraformer(**kwargs: Any) -> ParaformerLocal:
+    """取进程内共享的ParaformerLocal实例（相同参数只加载一次模型）"""
+    return _ParaformerRegistry.get(**kwargs)
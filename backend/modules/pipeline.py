@@ -1,7 +1,13 @@
 from typing import TypedDict, Union, Optional, Iterable, Tuple, List
+import queue
+import re
+import threading
 import time
 from logger import logger
 
+# 句子边界分隔符，捕获组让re.split把分隔符本身也保留下来
+_DELIM_RE = re.compile(r"([。，！!.,：])")
+
 class PipelineOutput:
     """
     TypedDict for the output of the pipeline.
@@ -13,239 +19,6 @@ class PipelineOutput:
         self.text = text
         self.asr_text = asr_text
 
-# class SimplePipeline:
-#     def __init__(
-#         self,
-#         asr_model,
-#         llm_agent,
-#         tts_model,
-#         default_response: str = "对不起，我没听清，请您再说一遍",
-#         use_streaming_tts: bool = True,
-#     ):
-#         self.asr_model = asr_model
-#         self.llm_agent = llm_agent
-#         self.tts_model = tts_model
-#         self.default_response = default_response
-#         self.use_streaming_tts = use_streaming_tts
-
-#     def _validate_inputs(
-#         self, audio: Optional[Union[str, bytes]] = None, text: Optional[str] = None
-#     ) -> None:
-#         """验证输入参数的有效性"""
-#         if text is not None and audio is not None:
-#             raise ValueError("audio and text cannot be present at the same time")
-#         if text is None and audio is None:
-#             raise ValueError("either audio or text must be provided")
-
-#     def _process_audio_input(self, audio: Union[str, bytes]) -> str:
-#         """处理音频输入，返回识别的文本"""
-#         recognized_text = self.asr_model.recognize(audio)
-#         return recognized_text
-
-#     def _get_input_text(
-#         self, audio: Optional[Union[str, bytes]] = None, text: Optional[str] = None
-#     ) -> Tuple[str, Optional[str]]:
-#         """获取输入文本和ASR识别文本（如果有）"""
-#         self._validate_inputs(audio, text)
-
-#         if text is not None:
-#             return text, None
-#         else:
-#             start_time = time.time()
-#             recognized_text = self._process_audio_input(audio)
-#             logger.debug(
-#                 f"Non-streaming ASR inference time: {time.time() - start_time:.4f}s"
-#             )
-#             return recognized_text, recognized_text
-
-#     def _synthesize_with_fallback(self, text: str, context: str = "") -> bytes:
-#         """TTS合成，失败时使用默认响应（非流式版本）"""
-#         try:
-#             audio_output = self.tts_model.synthesize(text)
-#             return audio_output
-#         except Exception as e:
-#             # 回退到默认响应
-#             try:
-#                 return self.tts_model.synthesize(self.default_response)
-#             except Exception as fallback_error:
-#                 raise fallback_error
-
-#     def _synthesize_stream_with_fallback(
-#         self, text: str, context: str = ""
-#     ) -> Iterable[bytes]:
-#         """TTS流式合成，失败时使用默认响应"""
-#         try:
-#             # 使用流式TTS合成
-#             for audio_chunk in self.tts_model.synthesize_stream(text):
-#                 yield audio_chunk
-#         except Exception as e:
-#             logger.error(f"Failed to synthesize TTS: {e}")
-#             # 回退到默认响应的流式合成
-#             try:
-#                 for audio_chunk in self.tts_model.synthesize_stream(
-#                     self.default_response
-#                 ):
-#                     yield audio_chunk
-#             except Exception:
-#                 # 最后的回退：使用非流式方法
-#                 fallback_audio = self.tts_model.synthesize(self.default_response)
-#                 yield fallback_audio
-
-#     def _split_text_by_delimiters(self, accumulated_text: str) -> Tuple[List[str], str]:
-#         """根据分隔符分割文本，返回完整句子列表和剩余文本"""
-#         sentences = []
-#         temp_text = accumulated_text
-
-#         # 找到所有的逗号和句号位置，增加冒号作为分隔符
-#         for delimiter in ["。", "，", "！", "!", ".", ",", "："]:
-#             if delimiter in temp_text:
-#                 parts = temp_text.split(delimiter)
-#                 if len(parts) > 1:
-#                     # 保留除了最后一个部分的所有内容（因为最后一个部分可能不完整）
-#                     for i in range(len(parts) - 1):
-#                         if parts[i].strip():
-#                             sentences.append(parts[i].strip() + delimiter)
-#                     # 更新累积文本为最后一个未完成的部分
-#                     temp_text = parts[-1]
-#                     break
-
-#         return sentences, temp_text
-
-#     def _create_pipeline_output(
-#         self, audio: bytes, text: str, asr_text: Optional[str] = None
-#     ) -> PipelineOutput:
-#         """创建PipelineOutput对象"""
-#         return PipelineOutput(
-#             audio=audio,
-#             text=text,
-#             asr_text=asr_text,
-#         )
-
-#     def _yield_tts_output(
-#         self, text: str, asr_text: Optional[str], context: str = ""
-#     ) -> Iterable[PipelineOutput]:
-#         """TTS合成并yield输出，包含错误处理"""
-#         try:
-#             audio_output = self._synthesize_with_fallback(text, context)
-#             yield self._create_pipeline_output(audio_output, text, asr_text)
-#         except Exception as e:
-#             # 如果连默认响应都失败了，yield默认响应但不包含音频
-#             yield self._create_pipeline_output(b"", self.default_response, asr_text)
-
-#     def _yield_tts_stream_output(
-#         self, text: str, asr_text: Optional[str], context: str = ""
-#     ) -> Iterable[PipelineOutput]:
-#         """TTS流式合成并yield输出，包含错误处理"""
-#         try:
-#             for audio_chunk in self._synthesize_stream_with_fallback(text, context):
-#                 # 每个音频块都作为单独的输出yield
-#                 yield self._create_pipeline_output(audio_chunk, text, asr_text)
-
-#         except Exception as e:
-#             # 如果流式合成完全失败，yield默认响应但不包含音频
-#             yield self._create_pipeline_output(b"", self.default_response, asr_text)
-
-#     def generate(
-#         self,
-#         audio: Optional[Union[str, bytes]] = None,
-#         text: Optional[str] = None,
-#         generation_args: Optional[dict] = None,
-#     ) -> PipelineOutput:
-#         if generation_args is None:
-#             generation_args = {}
-
-#         # 获取输入文本
-#         input_text, recognized_text = self._get_input_text(audio, text)
-#         logger.debug(f"Input text: {input_text}")
-#         # 生成响应文本
-#         start_time = time.time()
-#         response_text = self.llm_agent.generate(input_text, **generation_args)
-#         logger.debug(f"Task agent inference time: {time.time() - start_time:.4f}s")
-
-#         # TTS合成
-#         start_time = time.time()
-#         audio_output = self._synthesize_with_fallback(response_text)
-#         logger.debug(f"TTS inference time: {time.time() - start_time:.4f}s")
-
-#         return self._create_pipeline_output(
-#             audio_output, response_text, recognized_text
-#         )
-
-#     # Another version of generate_stream, split text by delimiters first before TTS
-#     def generate_stream(
-#         self,
-#         audio: Optional[Union[str, bytes]] = None,
-#         text: Optional[str] = None,
-#         generation_args: Optional[dict] = None,
-#     ) -> Iterable[PipelineOutput]:
-#         if generation_args is None:
-#             generation_args = {}
-
-#         # 获取输入文本
-#         input_text, recognized_text = self._get_input_text(audio, text)
-
-#         # 收集生成的文本片段
-#         accumulated_text = ""
-
-#         # TODO: improve first chunk splitting logic
-#         no_sentence_processed = True
-#         FIRST_CHUNK_LEN = 5
-
-#         # 从task_driven_agent流式生成
-#         for response_chunk in self.llm_agent.generate_stream(
-#             input_text, **generation_args
-#         ):
-#             accumulated_text += response_chunk
-
-#             # 分割文本
-#             sentences, remaining_text = self._split_text_by_delimiters(accumulated_text)
-
-#             # 处理完整的句子 - 根据配置选择TTS方式
-#             for sentence in sentences:
-#                 if self.use_streaming_tts:
-#                     yield from self._yield_tts_stream_output(
-#                         sentence, recognized_text, f"'{sentence}'"
-#                     )
-#                 else:
-#                     yield from self._yield_tts_output(
-#                         sentence, recognized_text, f"'{sentence}'"
-#                     )
-
-#             # 更新累积文本
-#             accumulated_text = remaining_text
-
-#         # 处理最后剩余的文本（如果有的话） - 根据配置选择TTS方式
-#         if accumulated_text.strip():
-#             if self.use_streaming_tts:
-#                 yield from self._yield_tts_stream_output(
-#                     accumulated_text.strip(),
-#                     recognized_text,
-#                     f"final text '{accumulated_text.strip()}'",
-#                 )
-#             else:
-#                 yield from self._yield_tts_output(
-#                     accumulated_text.strip(),
-#                     recognized_text,
-#                     f"final text '{accumulated_text.strip()}'",
-#                 )
-
-#     def copy(self) -> "SimplePipeline":
-#         return SimplePipeline(
-#             self.asr_model,
-#             self.llm_agent.copy(),
-#             self.tts_model,
-#             self.default_response,
-#             self.use_streaming_tts,
-#         )
-
-#     def get_asr_model(self):
-#         return self.asr_model
-
-#     def get_tts_model(self):
-#         return self.tts_model
-
-
-
 class SimplePipeline:
     def __init__(
         self,
@@ -254,13 +27,21 @@ class SimplePipeline:
         tts_model,
         default_response: str = "对不起，我没听清，请您再说一遍",
         use_streaming_tts: bool = True,
+        first_chunk_min_len: int = 8,
     ):
         self.asr_model = asr_model
         self.llm = llm
         self.tts_model = tts_model
+        # 首块TTS的最短触发长度：攒够这么多字符即使没遇到分隔符也先合成，
+        # 用户感知延迟主要由第一段音频决定
+        self.first_chunk_min_len = first_chunk_min_len
         self.default_response = default_response
         self.use_streaming_tts = use_streaming_tts
 
+        # chunk类型 -> 取文本函数的缓存；流内chunk类型固定，
+        # 探测一次后后续每个token只做一次dict查找
+        self._extractor_cache: dict = {}
+
     def _process_audio_input(self, audio: Union[str, bytes]) -> str:
         """处理音频输入，返回识别的文本"""
         recognized_text = self.asr_model.recognize(audio)
@@ -268,24 +49,30 @@ class SimplePipeline:
 
     def _extract_text(self, chunk) -> str:
         """从LLM流式chunk中提取文本，兼容字符串和AIMessageChunk"""
+        try:
+            return self._extractor_cache[type(chunk)](chunk)
+        except KeyError:
+            extractor = self._probe_extractor(chunk)
+            self._extractor_cache[type(chunk)] = extractor
+            return extractor(chunk)
+
+    @staticmethod
+    def _probe_extractor(chunk):
+        """按chunk类型探测一次取文本方式，返回可缓存的提取函数"""
         if isinstance(chunk, str):
-            return chunk
+            return lambda c: c
 
-        text = getattr(chunk, "content", None)
-        if text:
-            return text
+        if hasattr(chunk, "content"):
+            return lambda c: c.content or ""
 
         message = getattr(chunk, "message", None)
-        if message:
-            content = getattr(message, "content", None)
-            if content:
-                return content
+        if message is not None and hasattr(message, "content"):
+            return lambda c: c.message.content or ""
 
-        text_attr = getattr(chunk, "text", None)
-        if text_attr:
-            return text_attr
+        if hasattr(chunk, "text"):
+            return lambda c: c.text or ""
 
-        return ""
+        return lambda c: ""
     
     def _synthesize_stream_with_fallback(
         self, text: str
@@ -309,24 +96,22 @@ class SimplePipeline:
         )
 
     def _split_text_by_delimiters(self, accumulated_text: str) -> Tuple[List[str], str]:
-        """根据分隔符分割文本，返回完整句子列表和剩余文本"""
+        """根据分隔符分割文本，返回完整句子列表和剩余文本
+
+        预编译正则一趟线性扫描切出所有分隔符，代替原来逐分隔符的
+        `in`+split多趟扫描；而且旧实现只认第一种命中的分隔符，
+        混用中英文标点时会打乱句子顺序，这里天然按出现顺序切。
+        """
+        # split结果为[文本, 分隔符, 文本, 分隔符, ..., 尾部未完成文本]
+        parts = _DELIM_RE.split(accumulated_text)
         sentences = []
-        temp_text = accumulated_text
-
-        # 找到所有的逗号和句号位置，增加冒号作为分隔符
-        for delimiter in ["。", "，", "！", "!", ".", ",", "："]:
-            if delimiter in temp_text:
-                parts = temp_text.split(delimiter)
-                if len(parts) > 1:
-                    # 保留除了最后一个部分的所有内容（因为最后一个部分可能不完整）
-                    for i in range(len(parts) - 1):
-                        if parts[i].strip():
-                            sentences.append(parts[i].strip() + delimiter)
-                    # 更新累积文本为最后一个未完成的部分
-                    temp_text = parts[-1]
-                    break
+        for i in range(0, len(parts) - 1, 2):
+            piece = parts[i].strip()
+            if piece:
+                # 分隔符跟在对应文本后面一起发给TTS
+                sentences.append(piece + parts[i + 1])
 
-        return sentences, temp_text
+        return sentences, parts[-1]
     
     def _yield_tts_stream_output(
         self, text: str, asr_text: Optional[str]
@@ -347,38 +132,97 @@ class SimplePipeline:
         text: Optional[str] = None,
         generation_args: Optional[dict] = None,
     ) -> Iterable[PipelineOutput]:
+        """流式生成回复：LLM产句与TTS合成重叠执行
+
+        LLM流在后台线程里消费并切句入队，调用方线程边取句边合成。
+        单线程顺序执行时合成一句的工夫LLM在空转，总时长是两者之和；
+        重叠后趋近max(LLM, TTS)。句子的产出内容与顺序不变。
+        """
         if generation_args is None:
             generation_args = {}
 
-        # 收集生成的文本片段
-        accumulated_text = ""
-        
-        # 从task_driven_agent流式生成
-        for response_chunk in self.llm.generate_stream(input=text):
-            chunk_text = self._extract_text(response_chunk)
-            if not chunk_text:
-                continue
-
-            accumulated_text += chunk_text
-
-            # 分割文本
-            sentences, remaining_text = self._split_text_by_delimiters(accumulated_text)
-
-            # 处理完整的句子 - 根据配置选择TTS方式
-            for sentence in sentences:
-                yield from self._yield_tts_stream_output(
-                    sentence, text
-                )
-
-            # 更新累积文本
-            accumulated_text = remaining_text
-
-        # 处理最后剩余的文本（如果有的话） - 根据配置选择TTS方式
-        if accumulated_text.strip():
-            yield from self._yield_tts_stream_output(
-                accumulated_text.strip(),
-                text
-            )
+        sentence_queue: queue.Queue = queue.Queue()
+        _SENTINEL = object()
+        # 调用方提前关闭生成器（如被打断）时通知喂句线程停止
+        stop = threading.Event()
+
+        def _feed_sentences():
+            """后台线程：消费LLM流并按句切分入队"""
+            # 收集生成的文本片段；用list攒、需要切分时才join成串，
+            # 避免str +=逐token复制整个前缀的O(N²)开销
+            buf: List[str] = []
+            buf_len = 0
+
+            # 首块短触发：第一段音频还没发出去之前降低合成门槛
+            first_sentence_emitted = False
+
+            try:
+                for response_chunk in self.llm.generate_stream(input=text):
+                    if stop.is_set():
+                        return
+                    chunk_text = self._extract_text(response_chunk)
+                    if not chunk_text:
+                        continue
+
+                    buf.append(chunk_text)
+                    buf_len += len(chunk_text)
+
+                    # 新token里没有分隔符、又不到首块触发点，不必join整串扫描
+                    if not _DELIM_RE.search(chunk_text) and (
+                        first_sentence_emitted or buf_len < self.first_chunk_min_len
+                    ):
+                        continue
+
+                    accumulated_text = "".join(buf)
+
+                    # 首块还没发出且攒够了最短长度，不等分隔符直接合成，
+                    # 之后恢复正常的按句切分
+                    if (
+                        not first_sentence_emitted
+                        and len(accumulated_text) >= self.first_chunk_min_len
+                        and not _DELIM_RE.search(accumulated_text)
+                    ):
+                        sentence_queue.put(accumulated_text)
+                        first_sentence_emitted = True
+                        buf = []
+                        buf_len = 0
+                        continue
+
+                    # 分割文本
+                    sentences, remaining_text = self._split_text_by_delimiters(
+                        accumulated_text
+                    )
+
+                    for sentence in sentences:
+                        first_sentence_emitted = True
+                        sentence_queue.put(sentence)
+
+                    # 更新累积文本
+                    buf = [remaining_text] if remaining_text else []
+                    buf_len = len(remaining_text)
+
+                # 处理最后剩余的文本（如果有的话）
+                remaining_text = "".join(buf).strip()
+                if remaining_text:
+                    sentence_queue.put(remaining_text)
+            except Exception as e:
+                logger.error(f"LLM流式生成失败: {e}")
+            finally:
+                sentence_queue.put(_SENTINEL)
+
+        feeder = threading.Thread(
+            target=_feed_sentences, name="llm-sentence-feeder", daemon=True
+        )
+        feeder.start()
+        try:
+            while True:
+                sentence = sentence_queue.get()
+                if sentence is _SENTINEL:
+                    break
+                yield from self._yield_tts_stream_output(sentence, text)
+        finally:
+            stop.set()
+            feeder.join()
 
     def get_asr_model(self):
         return self.asr_model
@@ -33,16 +33,24 @@ class Service:
         logger.info(f"对话服务已初始化")
 
     async def handle_message_loop(self) -> None:
-        """处理消息循环"""
-        await self.input_gateway.handle_connection()
-        await self.input_gateway.handle_message_loop()
-
-    # async def stop(self) -> None:
-    #     """停止服务"""
-    #     try:
-    #         await self.asr_manager.shutdown()
-    #         await self.tts_manager.shutdown()
-    #         await self.event_bus.shutdown()
-
-    #     except Exception as e:
-    #         logger.error(f"停止服务时发生错误 - 会话: {self.session_id}, 错误: {e}")
+        """处理消息循环；连接结束后无条件释放本会话的资源"""
+        try:
+            await self.input_gateway.handle_connection()
+            await self.input_gateway.handle_message_loop()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """停止服务
+
+        逐个关停本会话持有的管理器。TTS的常驻工作线程靠shutdown里
+        的None哨兵退出，不在这里收尾的话每断一个连接就漏一个线程，
+        线程又引用着整个Service对象图，连内存也一起漏。
+        """
+        try:
+            await self.asr_manager.shutdown()
+            await self.tts_manager.shutdown()
+            await self.event_bus.shutdown()
+
+        except Exception as e:
+            logger.error(f"停止服务时发生错误: {e}")
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 import asyncio
+import logging
+import queue
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from typing import Optional, NamedTuple
 
@@ -16,6 +20,13 @@ from .events import (
 )
 from .interfaces import Manager
 
+# 音频入队前的本地攒批目标，约20ms @ 48kHz 16bit单声道；
+# 首块不受此限制立即入队，保证首音频延迟
+_AUDIO_FLUSH_BYTES = 2048
+
+# update_resp更新事件的去抖窗口：窗口内的连续更新只发最后一条
+_UPDATE_DEBOUNCE_SECS = 0.05
+
 
 class TTSQueueItem(NamedTuple):
     """TTS队列项的数据结构"""
@@ -26,7 +37,57 @@ class TTSQueueItem(NamedTuple):
     is_final: bool
 
 
-@dataclass
+class _RingBuffer:
+    """单生产者/单消费者的有界环形缓冲
+
+    asyncio.Queue每次get都要分配一个Future并经过一跳调度器，还带着
+    task_done/join的计数簿记。TTS链路只有一个生产者和一个消费者，
+    deque加两个Event就够了：put是一次append加事件置位，清空是O(1)
+    的deque.clear()，没有逐项取出的开销。
+    """
+
+    def __init__(self, maxlen: int = 256):
+        self._buf: deque = deque()
+        self._maxlen = maxlen
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+    async def put(self, item) -> None:
+        """放入一项；缓冲满时等消费者腾出空间（背压）"""
+        while len(self._buf) >= self._maxlen:
+            self._not_full.clear()
+            await self._not_full.wait()
+        self._buf.append(item)
+        self._not_empty.set()
+
+    async def get(self):
+        """取出一项；缓冲为空时等生产者写入"""
+        buf = self._buf
+        while not buf:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        item = buf.popleft()
+        if len(buf) < self._maxlen:
+            self._not_full.set()
+        return item
+
+    def put_nowait(self, item) -> None:
+        """无视容量直接放入，用于停止哨兵等控制项"""
+        self._buf.append(item)
+        self._not_empty.set()
+
+    def clear(self) -> None:
+        """O(1)清空缓冲并复位信号"""
+        self._buf.clear()
+        self._not_empty.clear()
+        self._not_full.set()
+
+    def empty(self) -> bool:
+        return not self._buf
+
+
+@dataclass(slots=True)
 class ConsumerState:
     """消费者状态"""
 
@@ -36,6 +97,15 @@ class ConsumerState:
     processed_tasks: int = 0
     errors: int = 0
 
+    def reset(self) -> None:
+        """就地清回初始值；持有旧引用的一方（如消费循环里的本地
+        绑定）看到的也是重置后的状态，不会拿着过期对象"""
+        self.running = False
+        self.processing = False
+        self.last_activity = 0.0
+        self.processed_tasks = 0
+        self.errors = 0
+
 
 class TTSManager(Manager):
     """事件驱动的TTS管理器"""
@@ -53,19 +123,52 @@ class TTSManager(Manager):
 
         # TTS状态
         self.is_paused = False  # 暂停状态
+        # 暂停/恢复信号：清除表示暂停，消费者在wait上挂起零开销，
+        # set即时唤醒，没有轮询间隔带来的恢复延迟
+        self._resumed = asyncio.Event()
+        self._resumed.set()
         self.current_task_id = 0
         self.current_text = ""  # 当前TTS文本
-        self.accumulated_text = ""  # 累积的TTS文本
+        # 累积的TTS文本，list攒片段、需要完整串时再join，
+        # 避免str +=逐段复制整个前缀
+        self.accumulated_parts: list = []
         self.asr_text = ""  # ASR识别的文本
         self.tts_gen_task: Optional[asyncio.Task] = None
 
-        # TTS音频队列（用于音频流处理）
-        self.tts_queue = asyncio.Queue()
+        # TTS音频队列（用于音频流处理），单生产者/单消费者环形缓冲
+        self.tts_queue = _RingBuffer()
 
         # 消费者状态
         self.consumer_state = ConsumerState()
         self.consumer_task: Optional[asyncio.Task] = None
 
+        # 待发布事件队列：消费者把事件append进来，由单个泵任务顺序
+        # 发布，热循环里不再为每个事件create_task或串行等待publish
+        self._pending_events: deque = deque()
+        self._pump_task: Optional[asyncio.Task] = None
+
+        # 文本更新去抖：窗口内攒下最新一条，定时器到点补发
+        self._pending_update: Optional[str] = None
+        self._update_timer: Optional[asyncio.TimerHandle] = None
+        self._last_update_time = 0.0
+
+        # 有界生成并发：换话时新生成不等旧任务取消收尾即可开始，
+        # 旧任务靠任务ID门禁挡在队列外，信号量防止级联重启堆积
+        self._gen_sem = asyncio.Semaphore(2)
+        self._allow_streaming_task_id = 0
+
+        # 攒批缓冲池：bytearray跨话语复用，容量随首次增长后保留，
+        # 不必每句话重新分配再扩容；并发生成时各取各的互不共享
+        self._scratch_pool: list = []
+
+        # 常驻TTS工作线程：省掉每话语一次的线程创建，也避开默认
+        # 执行器对已完成Future的引用滞留；空闲时阻塞在工单队列上
+        self._work_queue: queue.Queue = queue.Queue()
+        self._tts_thread = threading.Thread(
+            target=self._tts_worker_loop, daemon=True, name="tts-worker"
+        )
+        self._tts_thread.start()
+
         # 设置事件监听器
         self._setup_event_listeners()
 
@@ -105,13 +208,12 @@ class TTSManager(Manager):
             self.asr_text,
         )
 
-        # 异步启动TTS生成，不等待完成
+        # 异步启动TTS生成，不等待完成。旧任务只发取消不在这里等它
+        # 收尾：等待CancelledError传播完会拖慢打断后的首音频，
+        # 门禁已保证旧任务的残余产出进不了队列
         if self.tts_gen_task and not self.tts_gen_task.done():
             self.tts_gen_task.cancel()
-            try:
-                await self.tts_gen_task
-            except asyncio.CancelledError:
-                pass
+        self._allow_streaming_task_id = task_id
         self.tts_gen_task = asyncio.create_task(
             self.generate_tts_from_text(self.asr_text)
         )
@@ -123,41 +225,41 @@ class TTSManager(Manager):
 
         # 重置所有状态变量
         self.is_paused = False  # 清除暂停状态
+        self._resumed.set()
+        self._allow_streaming_task_id = -1  # 残存生成任务不得再入队
         self.current_text = ""  # 重置当前文本
-        self.accumulated_text = ""  # 重置累积文本
+        self.accumulated_parts = []  # 重置累积文本
         self.asr_text = ""  # 重置ASR文本
 
         # 取消TTS生成任务
-        if self.tts_gen_task and not self.tts_gen_task.done():
-            self.tts_gen_task.cancel()
-            try:
-                await self.tts_gen_task
-            except asyncio.CancelledError:
-                pass
-            self.tts_gen_task = None
+        await self._cancel_and_join(self.tts_gen_task)
+        self.tts_gen_task = None
 
-        # 停止消费者
+        # 停止消费者（内部已做取消等待，不在下面重复一遍）
         await self._stop_consumer()
 
-        # 清空TTS音频队列
-        while not self.tts_queue.empty():
-            try:
-                self.tts_queue.get_nowait()
-                self.tts_queue.task_done()
-            except asyncio.QueueEmpty:
-                break
+        # 清空TTS音频队列，O(1)
+        self.tts_queue.clear()
+        # 丢掉还没发布的旧任务事件和去抖中的文本更新
+        self._pending_events.clear()
+        self._pending_update = None
+        if self._update_timer is not None:
+            self._update_timer.cancel()
+            self._update_timer = None
+        self._last_update_time = 0.0
 
-        self.consumer_state = type(self.consumer_state)()
+        self.consumer_state.reset()
 
-        if self.consumer_task and not self.consumer_task.done():
-            self.consumer_task.cancel()
+        logger.info("TTS状态已完全重置")
+
+    async def _cancel_and_join(self, task: Optional[asyncio.Task]) -> None:
+        """取消任务并等它收尾；已完成或不存在的任务直接返回"""
+        if task and not task.done():
+            task.cancel()
             try:
-                await self.consumer_task
+                await task
             except asyncio.CancelledError:
                 pass
-            self.consumer_task = None
-
-        logger.info("TTS状态已完全重置")
 
     async def _start_consumer(self) -> None:
         """启动TTS消费者"""
@@ -172,14 +274,10 @@ class TTSManager(Manager):
     async def _stop_consumer(self) -> None:
         """停止TTS消费者"""
         self.consumer_state.running = False
+        # 哨兵唤醒可能阻塞在get上的消费者，让它看到running已落下
+        self.tts_queue.put_nowait(None)
 
-        if self.consumer_task and not self.consumer_task.done():
-            self.consumer_task.cancel()
-            try:
-                await self.consumer_task
-            except asyncio.CancelledError:
-                pass
-
+        await self._cancel_and_join(self.consumer_task)
         self.consumer_task = None
         logger.info("TTS消费者已停止")
 
@@ -196,6 +294,7 @@ class TTSManager(Manager):
             return
 
         self.is_paused = True
+        self._resumed.clear()
         logger.info("TTS已暂停")
 
     async def _resume_tts(self) -> None:
@@ -209,6 +308,7 @@ class TTSManager(Manager):
             return
 
         self.is_paused = False
+        self._resumed.set()
         logger.info("TTS已恢复")
 
     async def _tts_consumer(self) -> None:
@@ -216,80 +316,96 @@ class TTSManager(Manager):
         logger.debug("TTS消费者开始运行")
         last_sent_text = ""  # 记录上次发送的文本，避免重复发送
 
-        try:
-            while self.consumer_state.running:
-                # 检查是否处于暂停状态
-                if self.is_paused:
-                    # 暂停状态下不消费音频，等待恢复
-                    await asyncio.sleep(0.05)  # 50ms
-                    continue
+        # 热路径本地绑定，循环内省掉逐次的属性/MRO查找
+        # （与asr_manager消费循环同款写法）
+        queue_get = self.tts_queue.get
+        mk_chunk = EventFactory.create_tts_chunk_generated
+        enqueue_event = self._enqueue_event
+        state = self.consumer_state
+        debug = logger.debug
+        # debug关闭时连参数元组都不构造（每块一次的len()等）
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
+        try:
+            while state.running:
                 try:
-                    # 从TTS音频队列获取音频项
-                    item = await asyncio.wait_for(self.tts_queue.get(), timeout=0.1)
+                    # 从TTS音频队列获取音频项；空队列时在get上挂起，
+                    # 停止由_stop_consumer投递的None哨兵唤醒，不再用
+                    # 0.1秒超时轮询（空闲时每秒10个被取消的定时器）
+                    item = await queue_get()
 
                     if item is None:
-                        logger.debug("收到停止信号，TTS消费者退出")
+                        debug("收到停止信号，TTS消费者退出")
                         break
 
+                    # 暂停状态下挂住已取出的项，恢复信号一到立即继续，
+                    # 不再做50ms一次的轮询
+                    if self.is_paused:
+                        await self._resumed.wait()
+                        if not state.running:
+                            break
+
                     if item.task_id != self.current_task_id:
-                        logger.debug(
-                            "跳过旧任务的数据，任务ID: %s, 当前ID: %s",
-                            item.task_id,
-                            self.current_task_id,
-                        )
-                        self.tts_queue.task_done()
+                        if debug_enabled:
+                            debug(
+                                "跳过旧任务的数据，任务ID: %s, 当前ID: %s",
+                                item.task_id,
+                                self.current_task_id,
+                            )
                         continue
 
                     # 发送音频数据（如果有的话）
                     if item.audio_chunk:
                         try:
-                            # 改为通过事件总线发送，由前端监听并发送
-                            event = EventFactory.create_tts_chunk_generated(
+                            # 改为通过事件总线发送，由前端监听并发送；
+                            # 进泵队列即返回，发布与消费重叠执行
+                            event = mk_chunk(
                                 audio_chunk=item.audio_chunk,
                                 task_id=item.task_id,
                                 text=item.resp_text,
                             )
-                            await self.event_bus.publish(event)
-                            logger.debug(
-                                "发送TTS音频数据事件: %d 字节", len(item.audio_chunk)
-                            )
+                            enqueue_event(event)
+                            if debug_enabled:
+                                debug(
+                                    "发送TTS音频数据事件: %d 字节",
+                                    len(item.audio_chunk),
+                                )
                         except Exception as e:
                             logger.error("发送TTS音频数据事件失败: %s", e)
 
                     # 只有当文本内容发生变化时才发送
                     if item.resp_text != last_sent_text:
-                        await self._publish_tts_update(item.task_id, item.resp_text)
-                        logger.debug(
-                            "TTS生成更新，发送update_resp信号: %s", item.resp_text
-                        )
+                        self._publish_tts_update(item.task_id, item.resp_text)
+                        if debug_enabled:
+                            debug(
+                                "TTS生成更新，发送update_resp信号: %s",
+                                item.resp_text,
+                            )
                         last_sent_text = item.resp_text
                         # 更新当前文本
                         self.current_text = item.resp_text
-                        self.accumulated_text += item.resp_text
-
-                    await asyncio.sleep(0)
+                        self.accumulated_parts.append(item.resp_text)
 
                     if item.is_final:
-                        # 发布TTS完成事件
-                        asyncio.create_task(
-                            self._publish_tts_finished(item.task_id, item.resp_text)
+                        # 去抖窗口里攒着的文本先发出去，再发完成事件
+                        self._flush_pending_update()
+                        # 发布TTS完成事件；走同一个泵，保证排在前面的
+                        # 音频/更新事件之后发出
+                        enqueue_event(
+                            EventFactory.create_tts_response_finish(
+                                task_id=item.task_id, text=item.resp_text
+                            )
                         )
-                        logger.debug(
+                        debug(
                             "TTS生成完成，发送finish_resp信号: %s", item.resp_text
                         )
 
-                    self.tts_queue.task_done()
-                    self.consumer_state.last_activity = time.time()
-                    self.consumer_state.processed_tasks += 1
+                    state.last_activity = time.time()
+                    state.processed_tasks += 1
 
-                except asyncio.TimeoutError:
-                    continue
                 except Exception as e:
                     logger.error("TTS消费者处理音频时出错: %s", e)
-                    self.consumer_state.errors += 1
-                    if not self.tts_queue.empty():
-                        self.tts_queue.task_done()
+                    state.errors += 1
 
         except asyncio.CancelledError:
             logger.debug("TTS消费者被取消")
@@ -325,38 +441,73 @@ class TTSManager(Manager):
             "TTS开始事件已发布, 任务ID: %s", task_id
         )
 
-    async def _publish_tts_finished(self, task_id: int, final_text: str) -> None:
-        """
-        发布TTS完成事件
+    def _enqueue_event(self, event) -> None:
+        """把事件放进泵队列；首个事件负责拉起泵任务
 
-        Args:
-            task_id: 任务ID
-            final_text: 最终文本
+        整个突发只创建一个泵任务，后续事件只是deque.append，
+        避免热循环里每个事件一次create_task的分配和调度开销。
         """
-        event = EventFactory.create_tts_response_finish(
-            task_id=task_id, text=final_text
-        )
-        await self.event_bus.publish(event)
-
-        logger.debug(
-            "TTS完成事件已发布, 任务ID: %s",task_id
-        )
+        self._pending_events.append(event)
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._drain_events())
+
+    async def _drain_events(self) -> None:
+        """顺序发布泵队列里的事件，排空后退出"""
+        pending = self._pending_events
+        publish = self.event_bus.publish
+        while pending:
+            try:
+                await publish(pending.popleft())
+            except Exception as e:
+                logger.error("事件泵发布失败: %s", e)
 
-    async def _publish_tts_update(self, task_id: int, update_text: str) -> None:
+    def _publish_tts_update(self, task_id: int, update_text: str) -> None:
         """
-        发布TTS更新事件
+        发布TTS更新事件（fire-and-forget，带50ms去抖）
+
+        快速TTS生成器每句话能打出几十条文本更新，前端渲染跟不上
+        也没意义。距上次发布超过去抖窗口的立即发出；窗口内的只记
+        下最新文本，由call_later定时器到点补发，静默期不丢尾巴。
 
         Args:
             task_id: 任务ID
-            final_text: 最终文本
+            update_text: 更新文本
         """
+        now = time.monotonic()
+        if now - self._last_update_time >= _UPDATE_DEBOUNCE_SECS:
+            self._last_update_time = now
+            self._pending_update = None
+            self._do_publish_update(update_text)
+            return
+
+        self._pending_update = update_text
+        if self._update_timer is None:
+            self._update_timer = asyncio.get_running_loop().call_later(
+                _UPDATE_DEBOUNCE_SECS, self._flush_pending_update
+            )
+
+    def _flush_pending_update(self) -> None:
+        """把窗口内攒下的最后一条文本更新发出去"""
+        if self._update_timer is not None:
+            self._update_timer.cancel()
+            self._update_timer = None
+        if self._pending_update is None:
+            return
+        update_text = self._pending_update
+        self._pending_update = None
+        self._last_update_time = time.monotonic()
+        self._do_publish_update(update_text)
+
+    def _do_publish_update(self, update_text: str) -> None:
         event = EventFactory.create_tts_response_update(
             text=update_text, task_id=self.current_task_id
         )
-        await self.event_bus.publish(event)
+        # 文本更新只是UI展示，走nowait路径，慢订阅者不会卡住
+        # 下一个音频批的投递
+        self.event_bus.publish_nowait(event)
 
         logger.debug(
-            "TTS更新事件已发布，任务ID: %s",task_id
+            "TTS更新事件已发布，任务ID: %s", self.current_task_id
         )
 
     async def _publish_tts_pause(self, task_id: int, text: str) -> None:
@@ -394,11 +545,39 @@ class TTSManager(Manager):
         self.current_task_id += 1
         return self.current_task_id
 
+    def _tts_worker_loop(self) -> None:
+        """常驻工作线程：逐张取生成工单，迭代管道并把产出送回事件循环
+
+        工单为(loop, text, put_output, sentinel, stop_flag)；None为
+        关闭信号。被换话取消的工单靠stop_flag在下一个产出点退出。
+        """
+        while True:
+            job = self._work_queue.get()
+            if job is None:
+                break
+            loop, text, put_output, sentinel, stop_flag = job
+            try:
+                for output in self.pipeline.generate_stream(text=text):
+                    if stop_flag.is_set():
+                        break
+                    loop.call_soon_threadsafe(put_output, output)
+            except Exception as e:
+                logger.error("TTS生成器内部异常: %s", e)
+            finally:
+                try:
+                    loop.call_soon_threadsafe(put_output, sentinel)
+                except RuntimeError:
+                    # 事件循环已关闭，产出无处可送
+                    pass
+
     async def shutdown(self) -> None:
         """关闭TTS管理器"""
         # 停用TTS
         await self.reset_tts()
 
+        # 关停常驻工作线程
+        self._work_queue.put_nowait(None)
+
         logger.info("TTS管理器已关闭（shutdown）")
 
     async def generate_tts_from_text(self, text: str) -> None:
@@ -410,37 +589,59 @@ class TTSManager(Manager):
             task_id,
         )
 
+        # 有界并发：上限2允许新旧生成短暂重叠（新话立即开声，
+        # 旧任务慢慢收尾），再多的重启排队等
+        await self._gen_sem.acquire()
         try:
             loop = asyncio.get_running_loop()
 
-            # 直接使用同步生成器，避免async for的问题
-            def _gen():
-                try:
-                    for output in self.pipeline.generate_stream(text=text):
-                        yield output
-                except Exception as e:
-                    logger.error("TTS生成器内部异常: %s", e)
-                    raise
-
-            # 改为异步迭代，每个音频块生成后立即处理
+            # 同步生成器整个交给常驻工作线程跑完，产出经
+            # call_soon_threadsafe送回事件循环；这里只投一张工单，
+            # 没有线程创建也没有逐块的执行器往返
+            output_queue: asyncio.Queue = asyncio.Queue()
+            _SENTINEL = object()
+            put_output = output_queue.put_nowait
+            stop_flag = threading.Event()
+            self._work_queue.put((loop, text, put_output, _SENTINEL, stop_flag))
+
+            # 每个音频块送回事件循环后立即处理。
+            # resp_text是resp_parts的join缓存：片段攒在list里，
+            # 只在文本真正推进时重建一次完整串，入队直接用缓存
+            resp_parts: list = []
             resp_text = ""
+            last_text = ""
             chunk_count = 0
-            sync_gen = _gen()
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+            # 进队前先在本地攒音频：管道的块粒度很细，逐块入队意味着
+            # 每块都要过一遍消费者和事件总线。首块立即发保首音频延迟，
+            # 之后攒到目标字节或文本推进到新句子才入队一次。
+            # 缓冲从池里取，整句用完清空归还
+            audio_buf = (
+                self._scratch_pool.pop() if self._scratch_pool else bytearray()
+            )
+            first_flushed = False
+
+            async def _flush(is_final: bool = False) -> None:
+                nonlocal chunk_count
+                # 任务ID门禁：换话后旧任务照常生成收尾，但产出不再
+                # 入队，新任务的音频不会被旧内容插队
+                if task_id != self._allow_streaming_task_id:
+                    audio_buf.clear()
+                    return
+                await self.tts_queue.put(
+                    TTSQueueItem(task_id, bytes(audio_buf), resp_text, is_final)
+                )
+                audio_buf.clear()
+                chunk_count += 1
 
             try:
                 while True:
                     try:
-                        # 在线程池中执行同步生成器的next操作，使用更安全的方式
-                        def safe_next():
-                            try:
-                                return next(sync_gen)
-                            except StopIteration:
-                                return None  # 返回None表示生成器结束
-
-                        o = await loop.run_in_executor(None, safe_next)
+                        o = await output_queue.get()
 
-                        # 如果返回None，说明生成器已经结束
-                        if o is None:
+                        # 收到哨兵，说明生成器已经结束
+                        if o is _SENTINEL:
                             logger.debug(
                                 "TTS同步生成器正常结束，任务ID: %s",
                                 task_id,
@@ -450,19 +651,33 @@ class TTSManager(Manager):
                         ch = o.audio
                         new_text = o.text
 
-                        if not resp_text.endswith(new_text):
-                            resp_text += new_text
-
-                        # 将音频块和文本更新放入队列
-                        await self.tts_queue.put(
-                            TTSQueueItem(task_id, ch, resp_text, False)
-                        )
-                        chunk_count += 1
-                        logger.debug(
-                            "TTS生成第%d个音频块，任务ID: %s",
-                            chunk_count,
-                            task_id,
-                        )
+                        # 管道契约：同一句话的所有音频块携带同一个text
+                        # 串，句子推进时才换新串。先比身份再比内容，
+                        # 句内块O(1)判掉，不再对整个resp_text做endswith
+                        # 的逐字符尾部扫描
+                        if new_text is not last_text and new_text != last_text:
+                            # 文本推进到新句子，先把上一句攒的音频发出去
+                            if audio_buf:
+                                await _flush()
+                            resp_parts.append(new_text)
+                            resp_text = "".join(resp_parts)
+                            last_text = new_text
+
+                        if ch:
+                            audio_buf += ch
+
+                        if audio_buf and (
+                            not first_flushed
+                            or len(audio_buf) >= _AUDIO_FLUSH_BYTES
+                        ):
+                            await _flush()
+                            first_flushed = True
+                            if debug_enabled:
+                                logger.debug(
+                                    "TTS入队第%d个音频批，任务ID: %s",
+                                    chunk_count,
+                                    task_id,
+                                )
 
                     except Exception as e:
                         logger.error(
@@ -481,11 +696,10 @@ class TTSManager(Manager):
                 )
 
                 if resp_text:
-                    await self.tts_queue.put(
-                        TTSQueueItem(task_id, b"", resp_text, True)
-                    )
+                    # 残留的尾部音频随最终项一起入队
+                    await _flush(is_final=True)
                     logger.info(
-                        "TTS生成完成，任务ID: %s, 最终文本: %s, 音频块数: %d",
+                        "TTS生成完成，任务ID: %s, 最终文本: %s, 音频批数: %d",
                         task_id,
                         resp_text,
                         chunk_count
@@ -503,7 +717,7 @@ class TTSManager(Manager):
                     task_id
                 )
                 # 即使发生异常，也要尝试发送最终结果
-                if resp_text:
+                if resp_text and task_id == self._allow_streaming_task_id:
                     await self.tts_queue.put(
                         TTSQueueItem(task_id, b"", resp_text, True)
                     )
@@ -513,12 +727,12 @@ class TTSManager(Manager):
                         resp_text
                     )
             finally:
-                # 确保同步生成器被正确关闭
-                if hasattr(sync_gen, "close"):
-                    try:
-                        sync_gen.close()
-                    except Exception:
-                        pass
+                # 通知生产线程停止；它在下一个产出点退出
+                stop_flag.set()
+                # 清空后归还缓冲，底层存储保留给下一句复用
+                del audio_buf[:]
+                if len(self._scratch_pool) < 2:
+                    self._scratch_pool.append(audio_buf)
 
         except asyncio.CancelledError:
             logger.info(
@@ -537,3 +751,5 @@ class TTSManager(Manager):
                 component="TTSManager",
             )
             await self.event_bus.publish(error_event)
+        finally:
+            self._gen_sem.release()